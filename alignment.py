@@ -0,0 +1,93 @@
+from array import array
+from bisect import bisect_right
+
+from cue_table import CueTable
+
+"""Character offset index used to find the timecodes of text spans"""
+
+class AlignmentIndex:
+    """
+    Joins the texts of all blocks into one line (lines and blocks are separated by a single whitespace, same as the
+    text that sync_srt.sync re-segments) and keeps the offset where every block starts inside that line.
+    The timecode of any span of the joined text is then found with a bisect instead of searching the blocks for the text.
+
+        Example:
+            >>> index = AlignmentIndex(CueTable.from_srt("input.srt"))
+            >>> index.text
+            'Over the last year, we have witnessed what is the greatest crime of the 21st'
+            >>> index.span_timecode(0, 19)
+            (120, 900)
+    """
+    __slots__ = ('table', 'text', 'offsets', 'durations')
+
+    def __init__(self, table: CueTable):
+        self.table = table
+        texts = [' '.join(text.splitlines()) for text in table.texts()]
+        self.text = ' '.join(texts)
+        # block i covers text[offsets[i]:offsets[i + 1] - 1], the extra character is the whitespace between blocks
+        self.offsets = array('q', [0])
+        offset = 0
+        for text in texts:
+            offset += len(text) + 1
+            self.offsets.append(offset)
+        # durations are calculated the same way as 'duration_in_milliseconds' in prep_srt.srt_to_json
+        self.durations = [(end / 1000 - start / 1000) * 1000 for start, end in zip(table.starts, table.ends)]
+
+    def locate(self, position: int) -> int:
+        """
+        Returns the index of the block that contains the character at the given position of the joined text
+        """
+        return min(bisect_right(self.offsets, position) - 1, len(self.table) - 1)
+
+    def span_timecode(self, start: int, end: int) -> tuple[int, int]:
+        """
+        Calculates the timecode of the text between two positions of the joined text. Whitespaces at both ends of the
+        span are ignored, the timecode inside a block is proportional to the number of characters:
+
+        - Span starts at the start of a block: timecode start is the timecode start of the block
+        - Span ends at the end of a block: timecode end is the timecode end of the block
+        - Span starts and ends in the middle of the same block: the durations of the text before and after the span
+          are subtracted from the timecodes of the block
+        - Otherwise: the duration of the text from the span start to the block end is subtracted from the block end,
+          and the duration of the text from the block start to the span end is added to the block start
+
+            Parameters:
+                start (int): Position of the first character of the span
+                end (int): Position after the last character of the span
+
+            Returns:
+                tuple(int, int): Timecode start and timecode end of the span in milliseconds
+        """
+        text = self.text
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+
+        first = self.locate(start)
+        # an empty span gets the time of the position it is located at
+        last = self.locate(end - 1) if end > start else first
+
+        starts, ends = self.table.starts, self.table.ends
+        first_length = self.offsets[first + 1] - self.offsets[first] - 1
+        last_length = self.offsets[last + 1] - self.offsets[last] - 1
+        # position of the span start inside the first block and of the span end inside the last block
+        first_position = start - self.offsets[first]
+        last_position = end - self.offsets[last]
+        inside_one_block = first == last and first_position > 0 and last_position < last_length
+
+        if first_position == 0:
+            timecode_start = starts[first]
+        elif inside_one_block:
+            timecode_start = starts[first] + int(first_position / first_length * self.durations[first])
+        else:
+            timecode_start = ends[first] - int((first_length - first_position) / first_length * self.durations[first])
+
+        if last_position == last_length:
+            timecode_end = ends[last]
+        elif inside_one_block:
+            timecode_end = ends[last] - int((last_length - last_position) / last_length * self.durations[last])
+        else:
+            timecode_end = starts[last] + int(last_position / last_length * self.durations[last])
+
+        return timecode_start, timecode_end
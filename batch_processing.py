@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+"""Runs the same job for many files on all CPU cores"""
+
+def run_in_parallel(function: Callable, jobs: list[tuple], max_workers=None) -> list[tuple[tuple, Exception | None]]:
+    """
+    Calls the function once for every job in a pool of processes. An exception in one job doesn't stop the other jobs,
+    it is collected and returned with the results. A single job is run directly without starting a pool.
+
+        Parameters:
+            function (Callable): Function to be called, it must be defined at module level so it can be sent to the processes
+            jobs (list[tuple]): Arguments for every call of the function, for example [(file_1,), (file_2,)]
+            max_workers (int, optional): Number of processes, by default the number of CPU cores
+
+        Returns:
+            list[tuple(tuple, Exception or None)]: For every job (in the same order) its arguments and the exception
+                                                raised by the job or None if the job was successful
+
+        Example:
+            >>> run_in_parallel(sort.sort, [("a.srt",), ("missing.srt",)])
+            [(('a.srt',), None), (('missing.srt',), FileNotFoundError(2, 'No such file or directory'))]
+    """
+    return [(job, error) for job, _, error in map_in_parallel(function, jobs, max_workers)]
+
+def map_in_parallel(function: Callable, jobs: list[tuple], max_workers=None) -> list[tuple[tuple, object, Exception | None]]:
+    """
+    Same as run_in_parallel but keeps the values returned by the function
+
+        Returns:
+            list[tuple(tuple, object, Exception or None)]: For every job (in the same order) its arguments, the value
+                                                        returned by the job (None if it failed) and the exception or None
+    """
+    if len(jobs) <= 1:
+        results = []
+        for job in jobs:
+            try:
+                results.append((job, function(*job), None))
+            except Exception as e:
+                results.append((job, None, e))
+        return results
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(function, *job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                results.append((job, future.result(), None))
+            except Exception as e:
+                results.append((job, None, e))
+    return results
+
+def failed_jobs(results: list[tuple[tuple, Exception | None]]) -> list[tuple[tuple, Exception]]:
+    """
+    Returns only the jobs that raised an exception from the results of run_in_parallel
+    """
+    return [(job, error) for job, error in results if error is not None]
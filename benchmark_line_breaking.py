@@ -0,0 +1,67 @@
+import random
+import sys
+import time
+
+from alignment import AlignmentIndex
+from cue_table import CueTable
+from line_breaking import LineBreaker, OptimalLineBreaker
+
+"""
+Compares the greedy and the optimal line breaking of sync_srt.sync on a large transcript
+
+Usage:
+    python benchmark_line_breaking.py [srt_file] [max_char_per_line] [min_char_per_line]
+
+If no SRT file is given a random transcript of about 2 million characters is generated
+"""
+
+def generate_transcript(words_count: int, seed=0) -> str:
+    """
+    Generates a random transcript with sentences of different lengths and some punctuations
+    """
+    random_generator = random.Random(seed)
+    vocabulary = ("we", "have", "witnessed", "what", "is", "the", "greatest", "crime", "of", "century", "over", "last",
+                  "year", "people", "talking", "about", "numbers", "like", "15,000", "percent", "understanding", "a")
+    words = []
+    for _ in range(words_count):
+        word = random_generator.choice(vocabulary)
+        chance = random_generator.random()
+        if chance < 0.06:
+            word += "."
+        elif chance < 0.1:
+            word += ","
+        words.append(word)
+    return " ".join(words)
+
+def benchmark(line_breaker_class: type, text: str, max_char_per_line: int, min_char_per_line: int) -> dict:
+    """
+    Re-segments the text and measures the time and the quality of the segmentation
+
+        Returns:
+            dict: Time in seconds, throughput in characters per second, number of blocks and number of lines
+                shorter than min_char_per_line (not counting the last line)
+    """
+    start_time = time.perf_counter()
+    blocks = list(line_breaker_class(text, max_char_per_line, min_char_per_line, True).blocks())
+    elapsed = time.perf_counter() - start_time
+    lines = [line for _, _, block_text, _ in blocks for line in block_text.split("\n") if line]
+    return {
+        "seconds": elapsed,
+        "chars_per_second": len(text) / elapsed if elapsed else float('inf'),
+        "blocks": len(blocks),
+        "short_lines": sum(1 for line in lines[:-1] if len(line) < min_char_per_line),
+    }
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        text = AlignmentIndex(CueTable.from_srt(sys.argv[1])).text
+    else:
+        text = generate_transcript(300000)
+    max_char_per_line = int(sys.argv[2]) if len(sys.argv) > 2 else 42
+    min_char_per_line = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+
+    print(f"Transcript length: {len(text)} characters, max {max_char_per_line}, min {min_char_per_line}")
+    for name, line_breaker_class in (("greedy", LineBreaker), ("optimal", OptimalLineBreaker)):
+        result = benchmark(line_breaker_class, text, max_char_per_line, min_char_per_line)
+        print(f"{name:>8}: {result['seconds']:.2f}s, {result['chars_per_second']:,.0f} chars/s, "
+              f"{result['blocks']} blocks, {result['short_lines']} lines shorter than {min_char_per_line}")
@@ -0,0 +1,262 @@
+from array import array
+from typing import Iterable, Iterator
+
+import helper_functions as hf
+from srt_parser import iter_srt_blocks
+
+"""Compact array-backed storage for SRT blocks (cues)"""
+
+class Cue:
+    """
+    Lightweight read-only view of one block inside a CueTable, nothing is copied until an attribute is accessed
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: 'CueTable', index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def block_number(self) -> int:
+        return self.table.block_numbers[self.index]
+
+    @property
+    def start(self) -> int:
+        """Timecode start in milliseconds"""
+        return self.table.starts[self.index]
+
+    @property
+    def end(self) -> int:
+        """Timecode end in milliseconds"""
+        return self.table.ends[self.index]
+
+    @property
+    def duration(self) -> int:
+        """Duration of the block in milliseconds"""
+        return self.table.ends[self.index] - self.table.starts[self.index]
+
+    @property
+    def text(self) -> str:
+        return self.table.text_of(self.index)
+
+    @property
+    def time_code(self) -> str:
+        """Timecode with the format "hh:mm:ss,ms --> hh:mm:ss,ms" """
+        return f"{hf.convert_millisec_to_timecode(self.start)} --> {hf.convert_millisec_to_timecode(self.end)}"
+
+    def __repr__(self) -> str:
+        return f"Cue({self.block_number}, {self.time_code!r}, {self.text!r})"
+
+
+class CueTable:
+    """
+    Stores the blocks of an SRT file column wise: block numbers, timecode starts and timecode ends as integer arrays
+    (milliseconds) and the texts of all blocks in one string buffer with an offsets array pointing into it.
+    Compared to a list of dicts per block this needs a fraction of the memory and timecodes never have to be re-parsed.
+
+        Example:
+            >>> table = CueTable.from_srt("input.srt")
+            >>> table[0]
+            Cue(1, '00:00:00,120 --> 00:00:01,640', 'Over the last year,\\nwe have witnessed')
+            >>> table.starts[0], table.ends[0]
+            (120, 1640)
+    """
+    __slots__ = ('block_numbers', 'starts', 'ends', 'text_offsets', 'text')
+
+    def __init__(self, block_numbers: array, starts: array, ends: array, text_offsets: array, text: str):
+        self.block_numbers = block_numbers
+        self.starts = starts
+        self.ends = ends
+        # text of block i is text[text_offsets[i]:text_offsets[i + 1]]
+        self.text_offsets = text_offsets
+        self.text = text
+
+    @classmethod
+    def from_blocks(cls, blocks: Iterable[tuple[int, str, str, str]]) -> 'CueTable':
+        """
+        Builds a table from (block number, timecode start, timecode end, text) tuples as yielded by srt_parser
+
+            Parameters:
+                blocks (iterable of tuple(int, str, str, str)): Blocks of an SRT file
+
+            Returns:
+                CueTable: Table holding the blocks
+        """
+        block_numbers = array('q')
+        start_strings = []
+        end_strings = []
+        text_offsets = array('q', [0])
+        texts = []
+        offset = 0
+        for block_number, start, end, text in blocks:
+            block_numbers.append(block_number)
+            start_strings.append(start)
+            end_strings.append(end)
+            texts.append(text)
+            offset += len(text)
+            text_offsets.append(offset)
+        # convert the timecode columns in bulk
+        starts = hf.parse_time_strings(start_strings)
+        ends = hf.parse_time_strings(end_strings)
+        return cls(block_numbers, starts, ends, text_offsets, ''.join(texts))
+
+    @classmethod
+    def from_srt(cls, srt_file_path: str) -> 'CueTable':
+        """
+        Parses an SRT file into a table
+
+            Parameters:
+                srt_file_path (str): Path to the SRT file
+
+            Returns:
+                CueTable: Table holding the blocks of the SRT file
+        """
+        return cls.from_blocks(iter_srt_blocks(srt_file_path))
+
+    @classmethod
+    def from_json(cls, json_data: dict) -> 'CueTable':
+        """
+        Builds a table from the JSON structure generated by prep_srt.srt_to_json
+
+            Parameters:
+                json_data (dict): Python dictionary with the key 'entries'
+
+            Returns:
+                CueTable: Table holding the entries
+        """
+        return cls.from_blocks(
+            (entry['block_number'], entry['time_code_start'], entry['time_code_end'], entry['text'])
+            for entry in json_data.get('entries', [])
+        )
+
+    @classmethod
+    def from_order(cls, table: 'CueTable', order: Iterable[int]) -> 'CueTable':
+        """
+        Builds a new table from the blocks of another table taken in the given order of indices
+        """
+        block_numbers = array('q')
+        starts = array('q')
+        ends = array('q')
+        text_offsets = array('q', [0])
+        texts = []
+        offset = 0
+        for index in order:
+            block_numbers.append(table.block_numbers[index])
+            starts.append(table.starts[index])
+            ends.append(table.ends[index])
+            text = table.text_of(index)
+            texts.append(text)
+            offset += len(text)
+            text_offsets.append(offset)
+        return cls(block_numbers, starts, ends, text_offsets, ''.join(texts))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> Cue:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("cue index out of range")
+        return Cue(self, index)
+
+    def __iter__(self) -> Iterator[Cue]:
+        for index in range(len(self)):
+            yield Cue(self, index)
+
+    def text_of(self, index: int) -> str:
+        """Returns the text of the block at the given index"""
+        return self.text[self.text_offsets[index]:self.text_offsets[index + 1]]
+
+    def texts(self) -> Iterator[str]:
+        """Yields the texts of all blocks in order"""
+        offsets = self.text_offsets
+        for index in range(len(self)):
+            yield self.text[offsets[index]:offsets[index + 1]]
+
+    def sorted(self) -> 'CueTable':
+        """
+        Returns a new table with the blocks sorted by timecode start then timecode end, block numbers are kept
+        """
+        order = sorted(range(len(self)), key=lambda i: (self.starts[i], self.ends[i]))
+        return CueTable.from_order(self, order)
+
+    def write_srt(self, srt_file_path: str, renumber=False) -> None:
+        """
+        Writes the table to an SRT file
+
+            Parameters:
+                srt_file_path (str): Path of the output SRT file
+                renumber (bool): If True the blocks are numbered from 1 in the order of the table,
+                                else the original block numbers are kept
+
+            Returns:
+                None
+        """
+        block_numbers = range(1, len(self) + 1) if renumber else self.block_numbers
+        starts = hf.format_timecodes(self.starts)
+        ends = hf.format_timecodes(self.ends)
+        with open(srt_file_path, "w", encoding="utf-8") as f:
+            f.writelines(
+                f"{block_number}\n{start} --> {end}\n{text}\n\n"
+                for block_number, start, end, text in zip(block_numbers, starts, ends, self.texts())
+            )
+
+    def to_json(self) -> dict:
+        """
+        Converts the table into the JSON structure generated by prep_srt.srt_to_json
+
+            Returns:
+                dict: Python dictionary with the keys 'entries' and 'additional_info'
+        """
+        json_entries = []
+        weights = []
+
+        total_duration = 0  # Variable to store the total duration of the subtitle file
+        total_characters = len(self.text)  # Variable to store the total number of characters in the subtitle file
+
+        start_times = hf.format_timecodes(self.starts)
+        end_times = hf.format_timecodes(self.ends)
+
+        for cue_index, text in enumerate(self.texts()):
+            start_time = start_times[cue_index]
+            end_time = end_times[cue_index]
+            # Calculate the duration of the subtitle block
+            duration = self.ends[cue_index] / 1000 - self.starts[cue_index] / 1000
+
+            # Calculate the number of characters in the text
+            num_characters = len(text)
+            # Claculate the ratio of the text from this block to the tatal text
+            weight = (num_characters / total_characters) * 100
+            weights.append(weight)
+
+            json_entries.append({
+                'block_number': self.block_numbers[cue_index],
+                'time_code': f'{start_time} --> {end_time}',
+                'time_code_start': start_time,
+                'time_code_end': end_time,
+                'text': text,
+                'linebreak_in_text': True if '\n' in text else False,
+                'num_characters': num_characters,
+                'weight' : weight,
+                'duration_in_seconds': duration,
+                'duration_in_milliseconds': duration * 1000,
+            })
+
+            # Update total duration
+            total_duration += duration
+
+        # Calculate average characters per second
+        average_characters_per_second = total_characters / total_duration if total_duration > 0 else 0
+
+        # Additional information to include in the JSON file
+        additional_info = {
+            'total_duration': total_duration,
+            'total_characters': total_characters,
+            'total_weight': sum(weights),
+            'weights_list': weights,
+            'average_characters_per_second': average_characters_per_second,
+            'total_blocks': len(json_entries)
+        }
+
+        return {'entries': json_entries, 'additional_info': additional_info}
@@ -1,25 +1,98 @@
+import os
+from itertools import zip_longest
+
 import openpyxl
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill
 
 
-def compare_excel(path_to_first_excel, path_to_second_excel):
-    # Open the first Excel file
-    wb1 = openpyxl.load_workbook(path_to_first_excel)
-    ws1 = wb1.active
-    wb2 = openpyxl.load_workbook(path_to_second_excel)
-    ws2 = wb2.active
+def modified_path(path_to_excel: str) -> str:
+    # the output is saved next to the input with the prefix "modified"
+    folder, file_name = os.path.split(path_to_excel)
+    return os.path.join(folder, 'modified' + file_name)
+
+
+def compare_rows(rows1, rows2, ws1_out, ws2_out, fill: PatternFill) -> int:
+    """
+    Streams the rows of two sheets into the two output sheets, cells that differ get the fill.
+    Rows that are equal are copied without looking at their cells. Missing rows and cells count as empty.
+
+        Parameters:
+            rows1, rows2 (iterables of tuples): Rows of cell values, see Worksheet.iter_rows(values_only=True)
+            ws1_out, ws2_out: Write-only sheets of the output workbooks
+            fill (PatternFill): Fill of the differing cells
+
+        Returns:
+            int: The number of differing cells
+    """
+    differences = 0
+    for row1, row2 in zip_longest(rows1, rows2, fillvalue=()):
+        width = max(len(row1), len(row2))
+        row1 = tuple(row1) + (None,) * (width - len(row1))
+        row2 = tuple(row2) + (None,) * (width - len(row2))
+        if row1 == row2:
+            ws1_out.append(row1)
+            ws2_out.append(row2)
+            continue
+
+        out1, out2 = [], []
+        for value1, value2 in zip(row1, row2):
+            if value1 == value2:
+                out1.append(value1)
+                out2.append(value2)
+                continue
+            differences += 1
+            cell1, cell2 = WriteOnlyCell(ws1_out, value=value1), WriteOnlyCell(ws2_out, value=value2)
+            cell1.fill = fill
+            cell2.fill = fill
+            out1.append(cell1)
+            out2.append(cell2)
+        ws1_out.append(out1)
+        ws2_out.append(out2)
+    return differences
+
+
+def compare_excel(path_to_first_excel, path_to_second_excel) -> dict[str, int]:
+    """
+    Compares all the sheets of two Excel files cell by cell and saves a copy of each file where the differing cells are
+    filled with red ('modified' + file name). Sheets are matched by name, a sheet that exists in only one file is compared
+    with an empty sheet. The workbooks are read and written as streams (read-only and write-only mode), only one row
+    of each file is in memory at a time, so the output keeps the values and formulas but not the formatting of the inputs.
+
+        Parameters:
+            path_to_first_excel (str): Path to the first Excel file
+            path_to_second_excel (str): Path to the second Excel file
+
+        Returns:
+            dict: Sheet name -> number of differing cells
+    """
+    wb1 = openpyxl.load_workbook(path_to_first_excel, read_only=True)
+    wb2 = openpyxl.load_workbook(path_to_second_excel, read_only=True)
+    out1 = openpyxl.Workbook(write_only=True)
+    out2 = openpyxl.Workbook(write_only=True)
     # Set red fill color
     red_fill = PatternFill(start_color='FF0000', end_color='FF0000', fill_type='solid')
 
-    # Iterate over the cells in the first file and fill the background color with red if different
-    for row in range(1, ws1.max_row + 1):
-        for col in range(1, ws1.max_column + 1):
-            file1_cell = ws1.cell(row=row, column=col)
-            file2_cell = ws2.cell(row=row, column=col)
-            if file1_cell.value != file2_cell.value:
-                file1_cell.fill = red_fill
-                file2_cell.fill = red_fill
-
-    # Save the modified Excel file
-    wb1.save('modified' + path_to_first_excel)
-    wb2.save('modified' + path_to_second_excel)
+    # sheets of the first file in order, then the sheets that are only in the second file
+    sheet_names = wb1.sheetnames + [name for name in wb2.sheetnames if name not in wb1.sheetnames]
+    differences = {}
+    try:
+        for name in sheet_names:
+            rows = []
+            for wb in (wb1, wb2):
+                if name in wb.sheetnames:
+                    ws = wb[name]
+                    # the stored dimensions may be wrong, read every row that is in the file
+                    ws.reset_dimensions()
+                    rows.append(ws.iter_rows(values_only=True))
+                else:
+                    rows.append(())
+            differences[name] = compare_rows(rows[0], rows[1], out1.create_sheet(name), out2.create_sheet(name), red_fill)
+    finally:
+        wb1.close()
+        wb2.close()
+
+    # Save the modified Excel files
+    out1.save(modified_path(path_to_first_excel))
+    out2.save(modified_path(path_to_second_excel))
+    return differences
@@ -1,9 +1,13 @@
 import glob
 import json
 import re
+from array import array
+from typing import Iterable, Iterator
 
 from PyQt5.QtGui import QTextCharFormat, QColor
 
+from srt_parser import parse_srt_lines
+
 """Helper Functions"""
 
 def append_to_textedit(text_edit:object, text:str) -> None:
@@ -106,6 +110,24 @@ def clean_srt(srt_file_path:str) -> str:
     cleaned_lines = [line for line in cleaned_lines if line.strip()]
     return ''.join(cleaned_lines)
 
+def clean_extra_white_spaces(srt_file:str) -> None:
+    """
+    Remove the extra whitespaces from the end of each line in SRT file
+
+        Parameters:
+            srt_file (str): path to the SRT file
+
+        Return:
+            None
+    """
+    lines = []
+    with open(srt_file, "r", encoding='utf-8') as f:
+        lines = f.readlines()
+        lines = [line.strip() for line in lines]
+    with open(srt_file, "w", encoding='utf-8') as f:
+        for line in lines:
+            f.write(f"{line}\n")
+
 def convert_time_string_to_millisec(time_string:str) -> int:
     """
     Convert only one part of the timecode to millisec
@@ -173,6 +195,68 @@ def convert_millisec_to_timecode(milliseconds: int) -> str:
     return f"{hours:02}:{minutes:02}:{seconds:02},{milliseconds_remainder:03}"
 
 
+# time string with the format hh:mm:ss,ms (SRT) or hh:mm:ss.ms (VTT), matched once per line of a joined column
+TIME_STRING_PATTERN = re.compile(r'^(\d{2}):(\d{2}):(\d{2})[,.](\d{1,3})$', re.MULTILINE)
+
+def validate_time_strings(time_strings: list[str]) -> list[int]:
+    """
+    Validates the format of many time strings at once
+
+        Parameters:
+            time_strings (list[str]): Time strings that should have the format hh:mm:ss,ms or hh:mm:ss.ms
+
+        Returns:
+            list[int]: The indices of the time strings with a wrong format, empty if all time strings are valid
+
+        Example:
+            >>> validate_time_strings(["00:08:43,281", "0:08:43,281", "00:08:43.281"])
+            [1]
+    """
+    return [i for i, time_string in enumerate(time_strings) if not TIME_STRING_PATTERN.fullmatch(time_string)]
+
+def parse_time_strings(time_strings: list[str]) -> array:
+    """
+    Converts a whole column of time strings to milliseconds in one step, the column is joined and matched with one
+    regex pass instead of splitting every time string on its own
+
+        Parameters:
+            time_strings (list[str]): Time strings with the format hh:mm:ss,ms or hh:mm:ss.ms
+
+        Returns:
+            array: array('q') of the converted time strings in milliseconds
+
+        Raises:
+            ValueError: If one of the time strings has a wrong format
+
+        Example:
+            >>> parse_time_strings(["00:08:43,281", "00:04:11.878"])
+            array('q', [523281, 251878])
+    """
+    matches = TIME_STRING_PATTERN.findall("\n".join(time_strings))
+    if len(matches) != len(time_strings):
+        invalid = validate_time_strings(time_strings)
+        raise ValueError(f"Wrong time string format at index {invalid[0]}: {time_strings[invalid[0]]!r}")
+    return array('q', [int(h) * 3600000 + int(m) * 60000 + int(s) * 1000 + int(ms) for h, m, s, ms in matches])
+
+def format_timecodes(milliseconds: array | list[int], vtt=False) -> list[str]:
+    """
+    Converts a whole column of milliseconds to time strings in one step
+
+        Parameters:
+            milliseconds (array or list[int]): Times in milliseconds
+            vtt (bool): If True the milliseconds are separated with a dot (hh:mm:ss.ms) else with a comma (hh:mm:ss,ms)
+
+        Returns:
+            list[str]: The formatted time strings
+
+        Example:
+            >>> format_timecodes([251878, 523281])
+            ['00:04:11,878', '00:08:43,281']
+    """
+    time_format = "%02d:%02d:%02d.%03d" if vtt else "%02d:%02d:%02d,%03d"
+    return [time_format % (ms // 3600000, ms // 60000 % 60, ms // 1000 % 60, ms % 1000) for ms in milliseconds]
+
+
 def srt_to_plaintext(srt_file_path:str, save_output_where_input_is_located=False, output_file=None) -> None:
     """
     Converts srt to plain text removing time codes, block numbers and line breaks, then adds a new line break after every dot
@@ -214,91 +298,323 @@ def srt_to_plaintext(srt_file_path:str, save_output_where_input_is_located=False
     with open(f"{fileName}", "w", encoding='utf-8') as srt_file:
         srt_file.write(cleaned_lines)
 
-def sub_srt_codes(srt_file_path:str, save_output_where_input_is_located=False, max_char_per_chunk=5000) -> int:
+# a line holding only a block number, it is removed together with the timecode line after it
+BLOCK_NUMBER_LINE_PATTERN = re.compile(r'\d+\n')
+
+def iter_srt_text_lines(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Removes block numbers, timecodes and empty lines from the lines of a SRT file one line at a time
+
+        Parameters:
+            lines (iterable of str): Lines of a SRT file with their line breaks, for example an open file object
+
+        Returns:
+            iterator of str: The stripped lines of text
+    """
+    lines = iter(lines)
+    for line in lines:
+        pieces = (line,)
+        if BLOCK_NUMBER_LINE_PATTERN.fullmatch(line):
+            next_line = next(lines, None)
+            # a block number followed by a complete line (the timecode) is removed with that line
+            if next_line is not None and next_line.endswith("\n"):
+                continue
+            pieces = (line,) if next_line is None else (line, next_line)
+        for piece in pieces:
+            for text_line in piece.splitlines():
+                text_line = text_line.strip()
+                if text_line:
+                    yield text_line
+
+# inline marker "[[12]]" placed before the text of block 12 (counted from 0), it survives translation tools
+# and lets the reconstruction align the translated text with the blocks locally (see prep_srt.divide_text_with_anchors)
+ANCHOR_PATTERN = re.compile(r'\[\[(\d+)\]\]')
+
+def iter_anchored_text_lines(lines: Iterable[str], max_blocks_per_anchor=10) -> Iterator[str]:
+    """
+    Removes block numbers, timecodes and empty lines from the lines of a SRT file like iter_srt_text_lines, and puts
+    an anchor "[[index]]" before the first block and before every block that starts a new sentence, or that is
+    max_blocks_per_anchor blocks after the last anchor
+
+        Parameters:
+            lines (iterable of str): Lines of a SRT file, for example an open file object
+            max_blocks_per_anchor (int): The maximum number of blocks between two anchors
+
+        Returns:
+            iterator of str: The stripped lines of text
+
+        Example:
+            >>> list(iter_anchored_text_lines(["1", "00:00:00,120 --> 00:00:01,640", "Over the last year.", "",
+            ...                                "2", "00:00:01,640 --> 00:00:03,880", "We have witnessed"]))
+            ['[[0]] Over the last year.', '[[1]] We have witnessed']
+    """
+    texts = (text for _, _, _, text in parse_srt_lines(lines))
+    for index, (text, segment_start) in enumerate(mark_segment_starts(texts, max_blocks_per_anchor)):
+        text_lines = text.split("\n")
+        if segment_start:
+            text_lines[0] = f"[[{index}]] {text_lines[0]}"
+        yield from text_lines
+
+def mark_segment_starts(texts: Iterable[str], max_blocks_per_anchor=10) -> Iterator[tuple[str, bool]]:
+    """
+    Decides which blocks get an anchor (see iter_anchored_text_lines): the first block, every block that starts a new
+    sentence and every block that is max_blocks_per_anchor blocks after the last anchor
+
+        Parameters:
+            texts (iterable of str): Texts of the SRT blocks
+            max_blocks_per_anchor (int): The maximum number of blocks between two anchors
+
+        Returns:
+            iterator of tuple(str, bool): Every text with True if the block starts a new segment
+    """
+    last_anchor = 0
+    previous_text = ""
+    for index, text in enumerate(texts):
+        segment_start = index == 0 or previous_text.endswith((".", "!", "?")) or index - last_anchor >= max_blocks_per_anchor
+        if segment_start:
+            last_anchor = index
+        yield text, segment_start
+        previous_text = text
+
+def iter_text_chunks(text_lines: Iterable[str], max_char_per_chunk=5000) -> Iterator[str]:
+    """
+    Joins lines of text with whitespaces and splits the text into chunks at dots. A chunk ends at the last dot before
+    max_char_per_chunk is reached or, if there is no dot, at the first dot after it. Every chunk except the last one is
+    followed by two line breaks. The text is read lazily, only the text of the current chunk is kept in memory.
+
+        Parameters:
+            text_lines (iterable of str): Lines of text, see iter_srt_text_lines
+            max_char_per_chunk (int): The maximum number of characters per chunk
+
+        Returns:
+            iterator of str: The chunks
+
+        Example:
+            >>> list(iter_text_chunks(["Hello there. This is one.", "And two. And three"], 15))
+            ['Hello there.\n\n', 'This is one.\n\n', 'And two.\n\n', 'And three']
+    """
+    text_lines = iter(text_lines)
+    buffer = ""
+    exhausted = False
+    # a dot is added at the end of a text that doesn't end with one, so the last chunk ends at a dot
+    added_dot_at_end = False
+    first_chunk = True
+
+    def fill(length: int) -> None:
+        """Reads lines until the buffer is longer than length or the text has ended"""
+        nonlocal buffer, exhausted, added_dot_at_end
+        pieces = [buffer]
+        buffer_length = len(buffer)
+        while buffer_length <= length:
+            text_line = next(text_lines, None)
+            if text_line is None:
+                exhausted = True
+                break
+            if buffer_length or not first_chunk:
+                text_line = " " + text_line
+            pieces.append(text_line)
+            buffer_length += len(text_line)
+        buffer = "".join(pieces)
+        if exhausted and buffer and not buffer.endswith(".") and not added_dot_at_end:
+            buffer += "."
+            added_dot_at_end = True
+
+    def cut(chunk: str) -> str:
+        # remove the dot that was added, it is always the last character of the text
+        return chunk.strip()[:-1] if added_dot_at_end and not buffer else chunk.strip()
+
+    while True:
+        # position of the character where max_char_per_chunk is reached, the first chunk counts one character less
+        window_end = max_char_per_chunk - 1 if first_chunk else max_char_per_chunk - 2
+        fill(window_end)
+        if not buffer:
+            return
+        if window_end > len(buffer) - 1:
+            buffer, chunk = "", buffer
+            yield cut(chunk)
+            return
+
+        # the last dot inside the window (a dot at the very start of the text doesn't count)
+        split_index = buffer.rfind(".", 1 if first_chunk else 0, window_end + 1)
+        # or the first dot after the window
+        search_start = window_end + 1
+        while split_index == -1:
+            split_index = buffer.find(".", search_start)
+            if split_index == -1:
+                search_start = len(buffer)
+                fill(len(buffer))
+
+        buffer, chunk = buffer[split_index + 1:], buffer[:split_index + 1]
+        first_chunk = False
+        yield cut(chunk) + "\n\n"
+
+# a word or a run of punctuation, the pieces a tokenizer never merges across
+TOKEN_PIECE_PATTERN = re.compile(r'\w+|[^\w\s]+')
+# whitespace after the end of a sentence
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'(?<=[.!?])\s+')
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local approximation of the number of tokens a translation engine counts for a text, similar to a byte pair
+    encoding: every word is about one token per 4 bytes of UTF-8 (so Arabic or German words with umlauts count more than
+    English words of the same length) and every punctuation mark is one token
+
+        Parameters:
+            text (str): Input text
+
+        Returns:
+            int: The estimated number of tokens
+
+        Example:
+            >>> estimate_tokens("Over the last year, we have witnessed")
+            10
+    """
+    tokens = 0
+    for piece in TOKEN_PIECE_PATTERN.findall(text):
+        if piece[0].isalnum() or piece[0] == "_":
+            byte_length = len(piece) if piece.isascii() else len(piece.encode('utf-8'))
+            tokens += (byte_length + 3) // 4
+        else:
+            tokens += len(piece)
+    return tokens
+
+def iter_sentences(text_lines: Iterable[str]) -> Iterator[str]:
+    """
+    Joins lines of text with whitespaces and yields the sentences one by one, a sentence ends with '.', '!' or '?'
+    followed by a whitespace
+
+        Parameters:
+            text_lines (iterable of str): Stripped lines of text, see iter_srt_text_lines
+
+        Returns:
+            iterator of str: The sentences
+    """
+    # parts of the sentence that is not finished yet
+    pending = []
+    for text_line in text_lines:
+        sentences = SENTENCE_BOUNDARY_PATTERN.split(text_line)
+        # the whitespace that joins the lines ends the pending sentence if it ends with a punctuation
+        if pending and pending[-1][-1] in ".!?":
+            yield " ".join(pending)
+            pending = []
+        pending.append(sentences[0])
+        if len(sentences) > 1:
+            yield " ".join(pending)
+            yield from sentences[1:-1]
+            pending = [sentences[-1]]
+    if pending:
+        yield " ".join(pending)
+
+def iter_token_chunks(text_lines: Iterable[str], max_tokens_per_chunk: int, count_tokens=estimate_tokens,
+                      stats: dict | None = None) -> Iterator[str]:
+    """
+    Packs whole sentences into chunks of at most max_tokens_per_chunk tokens. Every sentence is counted once and a
+    chunk is closed as soon as the next sentence doesn't fit, for chunks of consecutive sentences this gives the
+    smallest possible number of chunks. A sentence longer than the budget gets a chunk of its own.
+    Every chunk except the last one is followed by two line breaks (same as iter_text_chunks).
+
+        Parameters:
+            text_lines (iterable of str): Stripped lines of text, see iter_srt_text_lines
+            max_tokens_per_chunk (int): The maximum number of tokens per chunk
+            count_tokens (Callable[[str], int]): Tokenizer that returns the number of tokens of a text, by default estimate_tokens
+            stats (dict, optional): If given it is filled with the number of 'chunks', the total number of 'tokens',
+                                    the 'max_tokens' of a chunk and the number of chunks 'over_budget'
+
+        Returns:
+            iterator of str: The chunks
+    """
+    if stats is None:
+        stats = {}
+    stats.update({"chunks": 0, "tokens": 0, "max_tokens": 0, "over_budget": 0})
+
+    def close(sentences: list[str], tokens: int) -> str:
+        stats["chunks"] += 1
+        stats["tokens"] += tokens
+        stats["max_tokens"] = max(stats["max_tokens"], tokens)
+        if tokens > max_tokens_per_chunk:
+            stats["over_budget"] += 1
+        return " ".join(sentences)
+
+    chunk, chunk_tokens = [], 0
+    previous_chunk = None
+    for sentence in iter_sentences(text_lines):
+        tokens = count_tokens(sentence)
+        if chunk and chunk_tokens + tokens > max_tokens_per_chunk:
+            # the previous chunk is only yielded once we know it is not the last one
+            if previous_chunk is not None:
+                yield previous_chunk + "\n\n"
+            previous_chunk = close(chunk, chunk_tokens)
+            chunk, chunk_tokens = [], 0
+        chunk.append(sentence)
+        chunk_tokens += tokens
+
+    if chunk:
+        if previous_chunk is not None:
+            yield previous_chunk + "\n\n"
+        previous_chunk = close(chunk, chunk_tokens)
+    if previous_chunk is not None:
+        yield previous_chunk
+
+def sub_srt_codes(srt_file_path:str, save_output_where_input_is_located=False, max_char_per_chunk=5000,
+                  max_tokens_per_chunk=None, count_tokens=estimate_tokens, stats=None, anchors=False) -> int:
     """
     Converts SRT file into plain text removing block numbers, time codes and empty lines from a SRT file.
-    Then splits the text into chunks with maximum length of 5000 characters
+    Then splits the text into chunks with maximum length of max_char_per_chunk characters (see iter_text_chunks),
+    or if max_tokens_per_chunk is given packs whole sentences into chunks of at most max_tokens_per_chunk tokens
+    (see iter_token_chunks). The file is processed as a stream, the chunks are written while the SRT file is read.
 
         Parameters:
         srt_file_path (srt): The path to the srt file
         save_output_where_input_is_located (bool): Flag to control where the output file should be saved
                                     - True: The output will be saved where the input file is located
                                     - False: The output will be saved where the program is executed
+        max_char_per_chunk (int): The maximum number of characters per chunk
+        max_tokens_per_chunk (int, optional): The maximum number of tokens per chunk, if given the text is chunked by tokens
+        count_tokens (Callable[[str], int]): Tokenizer used to count the tokens, by default estimate_tokens
+        stats (dict, optional): Filled with the chunk statistics when chunking by tokens (see iter_token_chunks)
+        anchors (bool): If True anchors are placed in the text at sentence starts (see iter_anchored_text_lines)
 
         Returns:
             int: The length of the output text after converting to plain text and splitting into chuncks
             
     """
-    added_dot_at_end = False
     path = re.sub(r"\\", "/", srt_file_path)
-    with open(path, 'r', encoding="utf-8") as f:
-        text = f.read()
-    # pattern that should match with digit or more then line break then a line that ends with a linebreak,
-    # which correspond to block number line then timecode line in a SRT file format.
-    pattern = re.compile(r'^\d+\n.*\n', re.MULTILINE)
-    # Replace the matches with the modified format
-    text = re.sub(pattern, "", text)
-    # split the text into lines
-    text = text.splitlines()
-    # remove empty lines
-    text = [line for line in text if line.strip()]
-    # strip lines
-    text = [line.strip() for line in text]
-    # rejoin the text back together with white spaces between lines
-    text = ' '.join(text)
-
-    # check if there is a dot at the end, if not add one
-    if text[-1] != '.':
-        text += '.'
-        added_dot_at_end = True
-
-    # splitting the text into lines with maximum length of 5000 characters
-    new_text = ""
-    marker = 0 # variable to save the location of the split for the chunk (the very start of the text or the index after a dot)
-    tracker = 0 # variable to count the characters
-    previous_dot_index = 0
-    dot_index = 0
 
-    for i, char in enumerate(text):
-        tracker += 1
-        # save the index of the dot
-        if '.' in char:
-            dot_index = i
-        # tracker is greater of equal the max character per chunk and a new dot was found
-        if tracker >= max_char_per_chunk and dot_index != previous_dot_index:
-            # new chunk is the index after the previous dot (marker) until the current dot
-            text_chunk = text[marker:dot_index + 1].strip()
-            # add the chunk to the new text with linebreaks at the end
-            new_text += text_chunk + "\n\n"
-            # update the marker (the index after the dot) to use as a start index for the next chunk
-            marker = dot_index + 1
-            # restart the tracker (text current inext - last dot index)
-            tracker = i - dot_index + 1
-            # update the previous dot index with the current dot index
-            previous_dot_index = dot_index
-        # tracker is smaller than the max character per chunk but we have reached the end of the text
-        if tracker < max_char_per_chunk and i == len(text) - 1:
-            # the last chunk (from the marker to the end of the text)
-            text_chunk = text[marker:].strip()
-            # add the chunk to the new text
-            new_text += text_chunk
-
-    # if we added a dot to the text, find it and remove it
-    if added_dot_at_end:
-        # (?!) negatie lookahead -- '.*' matches any character with zero occurance or more -- '\.' matches a literal dot
-        # \.(?!.*\.) --> this pattern find the last dot in the text
-        new_text = re.sub(r"\.(?!.*\.)", "", new_text)
-        
     # output should be saved where the input file is located
     if save_output_where_input_is_located:
         fileName = srt_file_path.rsplit(".", 1)[0]
     else:
         fileName = srt_file_path.split("/")
         fileName = fileName[-1].rsplit(".", 1)[0]
-    with open(f"{fileName}.txt", "w", encoding='utf-8') as srt_file:
-        srt_file.write(new_text)
 
-    return len(new_text)
+    with open(path, 'r', encoding="utf-8") as srt_file:
+        text_lines = iter_anchored_text_lines(srt_file) if anchors else iter_srt_text_lines(srt_file)
+        return write_text_chunks(text_lines, f"{fileName}.txt", max_char_per_chunk, max_tokens_per_chunk, count_tokens, stats)
+
+def write_text_chunks(text_lines: Iterable[str], txt_file_path: str, max_char_per_chunk=5000, max_tokens_per_chunk=None,
+                      count_tokens=estimate_tokens, stats=None) -> int:
+    """
+    Splits lines of text into chunks by characters (see iter_text_chunks) or by tokens if max_tokens_per_chunk is given
+    (see iter_token_chunks) and writes the chunks into a text file while the lines are read
+
+        Parameters:
+            text_lines (iterable of str): Stripped lines of text, see iter_srt_text_lines
+            txt_file_path (str): Path of the output file
+            max_char_per_chunk, max_tokens_per_chunk, count_tokens, stats: See sub_srt_codes
+
+        Returns:
+            int: The length of the output text
+    """
+    if max_tokens_per_chunk is None:
+        chunks = iter_text_chunks(text_lines, max_char_per_chunk)
+    else:
+        chunks = iter_token_chunks(text_lines, max_tokens_per_chunk, count_tokens, stats)
+    output_length = 0
+    with open(txt_file_path, "w", encoding='utf-8') as txt_file:
+        for chunk in chunks:
+            txt_file.write(chunk)
+            output_length += len(chunk)
+    return output_length
 
 
 def find_first_punctuation(text: str, punctuations: list) -> tuple[int, str]:
@@ -379,89 +695,6 @@ def split_text_by_whitespace(text: str, max_index: int):
     whitespace_index = text[:max_index].rfind(' ')
     return text[:whitespace_index], text[whitespace_index:]
 
-def calculate_timecode_by_ratio(timecode_duration, full_text, text_chunk):
-    """
-    Calculates the proportional duration for a text chunk from the full text, given the full duration of the text.
-
-        Parameters:
-            timecode_duration (int): The duration of the full text (in millisecond)
-            full_text (str): The input text string
-            text_chunk (str): A chunk of the full text
-        Returns:
-            int: The duration of the text chunk
-        Example:
-            >>> calculate_timecode_by_ratio(1500, "Hello, world", "Hello")
-            625
-    """
-    return int(len(text_chunk) / len(full_text) * timecode_duration)
-
-def split_text_with_max_char(text, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations):
-
-    def find_split_index(text, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations=None):
-        """
-        Finds the index at which the given text should be split into two lines.
-
-        Parameters:
-            text (str): The input text to split.
-            max_char_per_line (int): The maximum number of characters per line.
-            split_at_punctuation (bool): If True, prioritize splitting at punctuations.
-            punctuations (set or list, optional): Set or list of punctuation characters.
-
-        Returns:
-            int: The index at which to split the text.
-        """
-        if punctuations is None:
-            punctuations = {'.', ',', ':', '?', '!'}
-        else:
-            punctuations = set(punctuations)
-        
-        # Ensure max_char_per_line does not exceed the text length
-        max_char_per_line = min(max_char_per_line, len(text) - 1)
-        if len(text) <= min_char_per_line:
-            return len(text)
-        # Look for a punctuation from the right, starting from max_char_per_line
-        if split_at_punctuation:
-            for i in range(max_char_per_line, min_char_per_line -1, -1):
-                if text[i] in punctuations and i + 1 < len(text) and not text[i+1].isdigit():
-                    return i + 1  # Include the punctuation in the split
-
-        # If no punctuation is found, look for whitespace from the right
-        for i in range(max_char_per_line, -1, -1):
-            if text[i].isspace():
-                return i
-
-        # If no whitespace is found, return max_char_per_line
-        return max_char_per_line
-
-    hashtag_found = False
-    # Find split for the first line
-    split_index = find_split_index(text, max_char_per_line, min_char_per_line, False, punctuations)
-    line_one = text[:split_index]
-    remaining_text = text[split_index:]
-
-    if "##" in line_one: # if hashtag was found in line don't try and search for line two
-        hashtag_found = True
-        hashtag_index = line_one.find("##")
-        remaining_text = line_one[len("##") + hashtag_index:] + remaining_text
-        line_one = line_one[:hashtag_index].strip()
-        line_two = ""
-    
-    else:
-        # Find split for the second line
-        split_index = find_split_index(remaining_text, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations)
-        line_two = remaining_text[:split_index]
-        remaining_text = remaining_text[split_index:]
-
-        if "##" in line_two:
-            hashtag_found = True
-            hashtag_index = line_two.find("##")
-            remaining_text = line_two[len("##") + hashtag_index:] + remaining_text
-            line_one = f"{line_one.strip()}\n{line_two[:hashtag_index].strip()}"
-            line_two = ""
-
-    return line_one, line_two, remaining_text, hashtag_found
-
-
 def adjust_json_file(file_path: str, key: str|list, new_value) -> None:
     """
     Adjusts a JSON file by modifying a specified key(s) with a new value(s).
@@ -0,0 +1,209 @@
+import html
+from typing import Iterator
+
+from line_diff import Hunk, diff_hunks, diff_opcodes
+
+"""Side by side HTML views of the hunks of line_diff, replace difflib.HtmlDiff in the Compare tab"""
+
+# lines longer than this are not compared character by character, the whole line is marked as changed
+MAX_INTRALINE_LENGTH = 2000
+
+STYLES = """
+        table.diff {font-family:Courier; border:medium;}
+        .diff_header {background-color:#e0e0e0}
+        td.diff_header {text-align:right}
+        .diff_next {background-color:#c0c0c0}
+        .diff_add {background-color:#aaffaa}
+        .diff_chg {background-color:#ffff77}
+        .diff_sub {background-color:#ffaaaa}
+        td.diff_text {white-space:pre-wrap}
+        tr.diff_hunk td {background-color:#c0c0c0; height:4px; padding:0}"""
+
+LEGEND = """
+    <table class="diff" summary="Legends">
+        <tr> <th colspan="2"> Legends </th> </tr>
+        <tr> <td> <table border="" summary="Colors">
+                      <tr><th> Colors </th> </tr>
+                      <tr><td class="diff_add">&nbsp;Added&nbsp;</td></tr>
+                      <tr><td class="diff_chg">Changed</td> </tr>
+                      <tr><td class="diff_sub">Deleted</td> </tr>
+                  </table></td>
+        </tr>
+    </table>"""
+
+def highlight_line_pair(line1: str, line2: str) -> tuple[str, str]:
+    """
+    Escapes a changed line and its new version for HTML and marks the changed characters
+
+        Returns:
+            tuple(str, str): The HTML of the old and of the new line
+    """
+    if len(line1) > MAX_INTRALINE_LENGTH or len(line2) > MAX_INTRALINE_LENGTH:
+        return f'<span class="diff_chg">{html.escape(line1)}</span>', f'<span class="diff_chg">{html.escape(line2)}</span>'
+
+    parts1, parts2 = [], []
+    for tag, i1, i2, j1, j2 in diff_opcodes(line1, line2):
+        text1, text2 = html.escape(line1[i1:i2]), html.escape(line2[j1:j2])
+        if tag == 'equal':
+            parts1.append(text1)
+            parts2.append(text2)
+            continue
+        if text1:
+            parts1.append(f'<span class="{"diff_sub" if tag == "delete" else "diff_chg"}">{text1}</span>')
+        if text2:
+            parts2.append(f'<span class="{"diff_add" if tag == "insert" else "diff_chg"}">{text2}</span>')
+    return "".join(parts1), "".join(parts2)
+
+def hunk_rows(lines1: list[str], lines2: list[str], hunk: Hunk) -> Iterator[str]:
+    """
+    Yields the table rows of a hunk, every row shows a line of the first file and the matching line of the second
+    """
+    # lines read with readlines() keep their line breaks
+    lines1 = [line.rstrip("\r\n") for line in lines1[hunk.a_start:hunk.a_end]]
+    lines2 = [line.rstrip("\r\n") for line in lines2[hunk.b_start:hunk.b_end]]
+    a_offset, b_offset = hunk.a_start, hunk.b_start
+
+    def row(number1, text1, number2, text2) -> str:
+        return (f'<tr><td class="diff_header">{number1}</td><td class="diff_text">{text1}</td>'
+                f'<td class="diff_header">{number2}</td><td class="diff_text">{text2}</td></tr>\n')
+
+    for tag, i1, i2, j1, j2 in hunk.opcodes:
+        i1, i2, j1, j2 = i1 - a_offset, i2 - a_offset, j1 - b_offset, j2 - b_offset
+        if tag == 'equal':
+            for i, j in zip(range(i1, i2), range(j1, j2)):
+                yield row(a_offset + i + 1, html.escape(lines1[i]), b_offset + j + 1, html.escape(lines2[j]))
+            continue
+        # changed lines are paired one by one, the rest are deleted or added
+        paired = min(i2 - i1, j2 - j1)
+        for offset in range(paired):
+            text1, text2 = highlight_line_pair(lines1[i1 + offset], lines2[j1 + offset])
+            yield row(a_offset + i1 + offset + 1, text1, b_offset + j1 + offset + 1, text2)
+        for i in range(i1 + paired, i2):
+            yield row(a_offset + i + 1, f'<span class="diff_sub">{html.escape(lines1[i])}</span>', "", "")
+        for j in range(j1 + paired, j2):
+            yield row("", "", b_offset + j + 1, f'<span class="diff_add">{html.escape(lines2[j])}</span>')
+
+def write_header(f, from_description: str, to_description: str, preamble="") -> None:
+    f.write('<!DOCTYPE html>\n<html>\n<head>\n<meta http-equiv="Content-Type" content="text/html; charset=utf-8" />\n'
+            f'<title></title>\n<style type="text/css">{STYLES}\n</style>\n</head>\n<body>\n{preamble}'
+            '<table class="diff" cellspacing="0" cellpadding="0" rules="groups">\n'
+            f'<thead><tr><th class="diff_header" colspan="2">{html.escape(from_description)}</th>'
+            f'<th class="diff_header" colspan="2">{html.escape(to_description)}</th></tr></thead>\n<tbody>\n')
+
+def write_footer(f, postamble="") -> None:
+    f.write(f'</tbody>\n</table>\n{postamble}{LEGEND}\n</body>\n</html>\n')
+
+def write_html_diff(lines1: list[str], lines2: list[str], output_path: str, from_description="", to_description="") -> list[Hunk]:
+    """
+    Writes a side by side HTML comparison of two lists of lines showing the whole files, the rows are written while
+    they are generated
+
+        Parameters:
+            lines1 (list(str)): The content of the first file as a list of strings
+            lines2 (list(str)): The content of the second file as a list of strings
+            output_path (str): Path of the HTML file
+            from_description (str): Header of the first file's column
+            to_description (str): Header of the second file's column
+
+        Returns:
+            list[Hunk]: The hunks of the two files, empty if they are equal
+    """
+    # a context as long as the files keeps all the unchanged lines in a single hunk
+    hunks = diff_hunks(lines1, lines2, context=max(len(lines1), len(lines2)))
+
+    with open(output_path, 'w', encoding="utf-8") as f:
+        write_header(f, from_description, to_description)
+        for hunk in hunks or [Hunk([('equal', 0, len(lines1), 0, len(lines2))])]:
+            for row in hunk_rows(lines1, lines2, hunk):
+                f.write(row)
+        write_footer(f)
+    return hunks
+
+def hunk_summary(hunk: Hunk) -> tuple[int, int, int]:
+    """
+    Counts the lines of a hunk
+
+        Returns:
+            tuple(int, int, int): The number of added, deleted and changed lines
+    """
+    added = deleted = changed = 0
+    for tag, i1, i2, j1, j2 in hunk.opcodes:
+        if tag == 'equal':
+            continue
+        paired = min(i2 - i1, j2 - j1)
+        changed += paired
+        deleted += i2 - i1 - paired
+        added += j2 - j1 - paired
+    return added, deleted, changed
+
+def page_path(output_path: str, page: int) -> str:
+    """
+    Returns the path of a page, the first page is output_path itself, the others are "name_<page>.html"
+    """
+    if page == 1:
+        return output_path
+    base_name, extension = output_path.rsplit(".", 1) if "." in output_path.rsplit("/", 1)[-1] else (output_path, "html")
+    return f"{base_name}_{page}.{extension}"
+
+def write_hunk_pages(lines1: list[str], lines2: list[str], output_path: str, context=3, hunks_per_page=200,
+                     from_description="", to_description="", hunks=None) -> list[str]:
+    """
+    Writes a side by side HTML comparison that shows only the changed lines with context unchanged lines around them.
+    The hunks are split into pages of hunks_per_page hunks, the first page starts with a summary of all the changes
+    that links to every hunk. The rows are written while they are generated and the size of the output depends on the
+    size of the changes, not on the size of the files.
+
+        Parameters:
+            lines1 (list(str)): The content of the first file as a list of strings
+            lines2 (list(str)): The content of the second file as a list of strings
+            output_path (str): Path of the first page
+            context (int): Number of unchanged lines shown around every change
+            hunks_per_page (int): The maximum number of hunks per page
+            from_description (str): Header of the first file's column
+            to_description (str): Header of the second file's column
+            hunks (list[Hunk], optional): The hunks if they were already calculated with the same context
+
+        Returns:
+            list[str]: The paths of the pages
+    """
+    if hunks is None:
+        hunks = diff_hunks(lines1, lines2, context)
+    # a page holds at least one hunk, also if compare_hunks_per_page is 0 in the config
+    hunks_per_page = max(1, hunks_per_page)
+    page_count = max(1, -(-len(hunks) // hunks_per_page))
+    pages = [page_path(output_path, page) for page in range(1, page_count + 1)]
+    file_names = [path.replace("\\", "/").rsplit("/", 1)[-1] for path in pages]
+
+    # summary of all the hunks, every entry links to the hunk on its page
+    summaries = [hunk_summary(hunk) for hunk in hunks]
+    totals = [sum(summary[i] for summary in summaries) for i in range(3)]
+    summary = [f'<h3>{len(hunks)} changed sections: <span class="diff_add">{totals[0]} added</span>, '
+               f'<span class="diff_sub">{totals[1]} deleted</span>, <span class="diff_chg">{totals[2]} changed</span> lines</h3>\n']
+    if hunks:
+        summary.append('<table class="diff" summary="Changes">\n<tr><th>Section</th><th>Lines (first file)</th>'
+                       '<th>Lines (second file)</th><th>Added</th><th>Deleted</th><th>Changed</th></tr>\n')
+        for index, (hunk, (added, deleted, changed)) in enumerate(zip(hunks, summaries)):
+            link = f"{file_names[index // hunks_per_page]}#hunk{index + 1}"
+            summary.append(f'<tr><td><a href="{link}">{index + 1}</a></td><td>{hunk.a_start + 1}-{hunk.a_end}</td>'
+                           f'<td>{hunk.b_start + 1}-{hunk.b_end}</td><td>{added}</td><td>{deleted}</td><td>{changed}</td></tr>\n')
+        summary.append('</table>\n<br>\n')
+    else:
+        summary.append('<p>No differences found</p>\n')
+
+    for page in range(page_count):
+        navigation = []
+        if page > 0:
+            navigation.append(f'<a href="{file_names[page - 1]}">Previous page</a>')
+        navigation.append(f'Page {page + 1} of {page_count}')
+        if page + 1 < page_count:
+            navigation.append(f'<a href="{file_names[page + 1]}">Next page</a>')
+        navigation = f'<p>{" | ".join(navigation)}</p>\n'
+
+        with open(pages[page], 'w', encoding="utf-8") as f:
+            write_header(f, from_description, to_description, ("".join(summary) if page == 0 else "") + navigation)
+            for index in range(page * hunks_per_page, min((page + 1) * hunks_per_page, len(hunks))):
+                f.write(f'<tr class="diff_hunk" id="hunk{index + 1}"><td colspan="4"></td></tr>\n')
+                for row in hunk_rows(lines1, lines2, hunks[index]):
+                    f.write(row)
+            write_footer(f, navigation)
+    return pages
@@ -0,0 +1,248 @@
+import re
+from array import array
+from bisect import bisect_right
+from typing import Iterator
+
+"""Line breaking engine used to re-segment a transcript into SRT blocks"""
+
+WHITESPACE_PATTERN = re.compile(r'\s')
+
+class LineBreaker:
+    """
+    Splits a text into blocks of two lines (see split_index for the rules of a line) and works with positions inside
+    the one text instead of slicing off the remaining text for every block. The positions of whitespaces and of the
+    punctuations that are allowed to end a line are collected once, every split is then found with a bisect, so
+    re-segmenting a transcript takes linear time.
+
+        Example:
+            >>> breaker = LineBreaker("Over the last year, we have witnessed what is the greatest crime", 20, 10, False)
+            >>> [block_text for _, _, block_text, _ in breaker.blocks()]
+            ['Over the last year,\\nwe have witnessed', 'what is the\\ngreatest', 'crime']
+    """
+    __slots__ = ('text', 'max_char_per_line', 'min_char_per_line', 'split_at_punctuation', 'whitespaces', 'punctuation_breaks')
+
+    def __init__(self, text: str, max_char_per_line: int, min_char_per_line: int, split_at_punctuation: bool, punctuations=None):
+        """
+            Parameters:
+                text (str): The text to be split into blocks
+                max_char_per_line (int): The maximum number of characters per line
+                min_char_per_line (int): The minimum number of characters per line
+                split_at_punctuation (bool): If True, prioritize splitting the second line of a block at punctuations
+                punctuations (set or list, optional): Punctuation characters, default is {'.', ',', ':', '?', '!'}
+        """
+        self.text = text
+        self.max_char_per_line = max_char_per_line
+        self.min_char_per_line = min_char_per_line
+        self.split_at_punctuation = split_at_punctuation
+        self.whitespaces = array('q', [match.start() for match in WHITESPACE_PATTERN.finditer(text)])
+        self.punctuation_breaks = array('q')
+        if split_at_punctuation:
+            if punctuations is None:
+                punctuations = {'.', ',', ':', '?', '!'}
+            punctuations = [punctuation for punctuation in punctuations if len(punctuation) == 1]
+            if punctuations:
+                pattern = re.compile('[' + ''.join(re.escape(punctuation) for punctuation in punctuations) + ']')
+                # a punctuation followed by a digit is part of a number (15.000 or 15,000) and can't end a line
+                self.punctuation_breaks.extend(
+                    match.start() for match in pattern.finditer(text, 0, len(text) - 1)
+                    if not text[match.start() + 1].isdigit()
+                )
+
+    def split_index(self, position: int, split_at_punctuation: bool) -> int:
+        """
+        Finds the position where a line starting at the given position should end.
+
+        - If the rest of the text is not longer than min_char_per_line the line takes the rest of the text
+        - If split_at_punctuation is True the line ends after the last punctuation between min_char_per_line and max_char_per_line
+        - Otherwise the line ends at the last whitespace up to max_char_per_line
+        - If there is no whitespace up to max_char_per_line the line ends at the next whitespace, so a word is never cut
+
+            Parameters:
+                position (int): The start of the line
+                split_at_punctuation (bool): If True, prioritize splitting at punctuations
+
+            Returns:
+                int: The position after the last character of the line
+        """
+        text_length = len(self.text)
+        if text_length - position <= self.min_char_per_line:
+            return text_length
+        limit = min(position + self.max_char_per_line, text_length - 1)
+
+        if split_at_punctuation:
+            i = bisect_right(self.punctuation_breaks, limit) - 1
+            if i >= 0 and self.punctuation_breaks[i] >= position + self.min_char_per_line:
+                return self.punctuation_breaks[i] + 1  # Include the punctuation in the split
+
+        i = bisect_right(self.whitespaces, limit) - 1
+        # a whitespace at the very start of the line would give an empty line
+        if i >= 0 and self.whitespaces[i] > position:
+            return self.whitespaces[i]
+
+        # the word is longer than the line, it is kept whole
+        i += 1
+        return self.whitespaces[i] if i < len(self.whitespaces) else text_length
+
+    def blocks(self) -> Iterator[tuple[int, int, str, bool]]:
+        """
+        Splits the text into blocks of one or two lines. If a hashtag '##' is found inside a block the block ends
+        before the hashtag and the hashtag is the last part of the block
+
+            Returns:
+                iterator of tuple(int, int, str, bool): Start of the block, end of the block (after the hashtag if one was found),
+                                                        the text of the block and if a hashtag was found
+        """
+        text = self.text
+        position = 0
+        while position < len(text):
+            first_line_end = self.split_index(position, False)
+            hashtag_index = text.find("##", position, first_line_end)
+            if hashtag_index != -1: # if hashtag was found in line don't try and search for line two
+                yield position, hashtag_index + 2, text[position:hashtag_index].strip(), True
+                position = hashtag_index + 2
+                continue
+
+            second_line_end = self.split_index(first_line_end, self.split_at_punctuation)
+            hashtag_index = text.find("##", first_line_end, second_line_end)
+            line_one = text[position:first_line_end].strip()
+            if hashtag_index != -1:
+                yield position, hashtag_index + 2, f"{line_one}\n{text[first_line_end:hashtag_index].strip()}".strip(), True
+                position = hashtag_index + 2
+            else:
+                # a block without a second line has no line break, it would be an empty line inside the SRT block
+                block_text = f"{line_one}\n{text[first_line_end:second_line_end].strip()}".strip("\n")
+                yield position, second_line_end, block_text, False
+                position = second_line_end
+
+
+WORD_PATTERN = re.compile(r'\S+')
+
+class OptimalLineBreaker(LineBreaker):
+    """
+    Splits a text into blocks of two lines like LineBreaker, but instead of filling one line after the other the
+    line breaks of a whole paragraph (the text between two hashtags '##') are chosen together, Knuth-Plass style,
+    so that the total badness of the paragraph is as small as possible. The badness of a paragraph is the sum of:
+
+    - The squared number of characters missing from max_char_per_line on every line except the last one
+    - A high penalty for lines shorter than min_char_per_line (except the last line) and for lines longer than
+      max_char_per_line (only possible if a single word is longer)
+    - A penalty for every new block, so fewer and fuller blocks are preferred
+    - A bonus for lines that end at a punctuation if split_at_punctuation is True
+
+    A line can only span the words that fit into max_char_per_line, so every position only looks ahead a bounded
+    number of words and the segmentation takes near-linear time.
+
+        Example:
+            >>> breaker = OptimalLineBreaker("Over the last year, we have witnessed what is the greatest crime", 20, 10, False)
+            >>> [block_text for _, _, block_text, _ in breaker.blocks()]
+            ['Over the last year,\\nwe have witnessed', 'what is the greatest\\ncrime']
+    """
+    __slots__ = ('punctuation_break_set',)
+
+    def __init__(self, text: str, max_char_per_line: int, min_char_per_line: int, split_at_punctuation: bool, punctuations=None):
+        super().__init__(text, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations)
+        self.punctuation_break_set = set(self.punctuation_breaks)
+
+    def line_cost(self, start: int, end: int, last_line: bool) -> int:
+        """
+        Calculates the badness of one line
+
+            Parameters:
+                start (int): Position of the first character of the line
+                end (int): Position after the last character of the line
+                last_line (bool): If True the line is the last line of its paragraph
+
+            Returns:
+                int: The badness of the line
+        """
+        max_char_per_line = self.max_char_per_line
+        line_length = end - start
+        if line_length > max_char_per_line:
+            return 100 * line_length ** 2
+        if last_line:
+            return 0
+
+        cost = (max_char_per_line - line_length) ** 2
+        if line_length < self.min_char_per_line:
+            cost += 10 * (self.min_char_per_line - line_length) ** 2
+        elif end - 1 in self.punctuation_break_set:
+            cost -= (max_char_per_line - self.min_char_per_line) ** 2
+        return cost
+
+    def paragraph_lines(self, start: int, end: int) -> list[tuple[int, int]]:
+        """
+        Finds the optimal line breaks for the text between two positions
+
+            Parameters:
+                start (int): Start of the paragraph
+                end (int): End of the paragraph
+
+            Returns:
+                list of tuple(int, int): Start and end position of every line
+        """
+        words = [(match.start(), match.end()) for match in WORD_PATTERN.finditer(self.text, start, end)]
+        word_count = len(words)
+        if not word_count:
+            return []
+        block_penalty = self.max_char_per_line ** 2
+        infinity = float('inf')
+        # costs[parity][i] is the lowest badness of the first i words, where parity is the number of lines modulo 2,
+        # an even number of lines means the next line starts a new block
+        costs = [[infinity] * (word_count + 1), [infinity] * (word_count + 1)]
+        previous = [[None] * (word_count + 1), [None] * (word_count + 1)]
+        costs[0][0] = 0
+
+        for i in range(word_count):
+            line_start = words[i][0]
+            for parity in (0, 1):
+                cost_before = costs[parity][i]
+                if cost_before == infinity:
+                    continue
+                if parity == 0:
+                    cost_before += block_penalty
+                next_parity = 1 - parity
+                for j in range(i + 1, word_count + 1):
+                    line_end = words[j - 1][1]
+                    # a line can only hold more characters than the maximum if it is a single word
+                    if line_end - line_start > self.max_char_per_line and j > i + 1:
+                        break
+                    cost = cost_before + self.line_cost(line_start, line_end, j == word_count)
+                    if cost < costs[next_parity][j]:
+                        costs[next_parity][j] = cost
+                        previous[next_parity][j] = (i, parity)
+
+        # follow the cheapest path back from the last word
+        lines = []
+        j = word_count
+        parity = 0 if costs[0][word_count] <= costs[1][word_count] else 1
+        while j:
+            i, previous_parity = previous[parity][j]
+            lines.append((words[i][0], words[j - 1][1]))
+            j, parity = i, previous_parity
+        lines.reverse()
+        return lines
+
+    def blocks(self) -> Iterator[tuple[int, int, str, bool]]:
+        """
+        Splits the text into blocks of one or two lines, see LineBreaker.blocks
+        """
+        text = self.text
+        position = 0
+        while position < len(text):
+            hashtag_index = text.find("##", position)
+            paragraph_end = len(text) if hashtag_index == -1 else hashtag_index
+            lines = self.paragraph_lines(position, paragraph_end)
+
+            if not lines and hashtag_index != -1:
+                yield position, hashtag_index + 2, "", True
+            for i in range(0, len(lines), 2):
+                block_lines = lines[i:i + 2]
+                block_text = "\n".join(text[line_start:line_end] for line_start, line_end in block_lines)
+                block_start = position if i == 0 else block_lines[0][0]
+                # the last block of a paragraph ends with the hashtag
+                if i + 2 >= len(lines) and hashtag_index != -1:
+                    yield block_start, hashtag_index + 2, block_text, True
+                else:
+                    yield block_start, block_lines[-1][1], block_text, False
+
+            position = len(text) if hashtag_index == -1 else hashtag_index + 2
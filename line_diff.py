@@ -0,0 +1,287 @@
+from bisect import bisect_left
+from typing import Hashable, Sequence
+
+"""
+Line diff used by the Compare tab: patience diff with Myers' algorithm for the ranges without unique lines.
+The output uses the opcodes of difflib.SequenceMatcher ('equal', 'replace', 'delete', 'insert')
+"""
+
+# Myers' algorithm gives up on a range once this many edits are needed and reports the range as replaced,
+# it only runs on ranges where the patience diff found no unique lines
+MAX_EDIT_COST = 2000
+
+class Hunk:
+    """
+    A group of changes with the unchanged lines around them, the ranges are [start, end) indices of the two sequences
+
+        Example:
+            >>> hunk = diff_hunks(["a", "b", "c"], ["a", "x", "c"])[0]
+            >>> hunk.opcodes
+            [('equal', 0, 1, 0, 1), ('replace', 1, 2, 1, 2), ('equal', 2, 3, 2, 3)]
+    """
+    __slots__ = ('opcodes',)
+
+    def __init__(self, opcodes: list[tuple[str, int, int, int, int]]):
+        self.opcodes = opcodes
+
+    @property
+    def a_start(self) -> int:
+        return self.opcodes[0][1]
+
+    @property
+    def a_end(self) -> int:
+        return self.opcodes[-1][2]
+
+    @property
+    def b_start(self) -> int:
+        return self.opcodes[0][3]
+
+    @property
+    def b_end(self) -> int:
+        return self.opcodes[-1][4]
+
+    def __repr__(self) -> str:
+        return f"Hunk(a={self.a_start}:{self.a_end}, b={self.b_start}:{self.b_end})"
+
+def hash_lines(a: Sequence[Hashable], b: Sequence[Hashable]) -> tuple[list[int], list[int]]:
+    """
+    Replaces every line by a small integer, equal lines get the same integer, so the diff compares integers only
+    """
+    ids = {}
+    a_ids = [ids.setdefault(line, len(ids)) for line in a]
+    b_ids = [ids.setdefault(line, len(ids)) for line in b]
+    return a_ids, b_ids
+
+def unique_anchors(a: list[int], b: list[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int) -> list[tuple[int, int]]:
+    """
+    Patience step: pairs the lines that occur exactly once in both ranges and keeps the longest sequence of pairs that is
+    in order in both ranges (longest increasing subsequence, O(n log n))
+
+        Returns:
+            list[tuple(int, int)]: The positions (i, j) of the anchors, increasing in i and in j
+    """
+    # line -> position in a, or -1 if the line is not unique
+    a_positions = {}
+    for i in range(a_lo, a_hi):
+        a_positions[a[i]] = -1 if a[i] in a_positions else i
+    b_positions = {}
+    for j in range(b_lo, b_hi):
+        line = b[j]
+        if a_positions.get(line, -1) != -1:
+            b_positions[line] = -1 if line in b_positions else j
+    pairs = sorted((a_positions[line], j) for line, j in b_positions.items() if j != -1)
+    if not pairs:
+        return []
+
+    # patience sorting on the positions in b
+    tails = []          # smallest last j of an increasing subsequence of every length
+    tail_indices = []   # index in pairs of that last element
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        length = bisect_left(tails, j)
+        if length == len(tails):
+            tails.append(j)
+            tail_indices.append(index)
+        else:
+            tails[length] = j
+            tail_indices[length] = index
+        previous[index] = tail_indices[length - 1] if length else -1
+
+    anchors = []
+    index = tail_indices[-1]
+    while index != -1:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+def myers_matches(a: list[int], b: list[int], a_lo: int, a_hi: int, b_lo: int, b_hi: int) -> list[tuple[int, int]] | None:
+    """
+    Myers' O(ND) algorithm: finds the matching lines of a shortest edit script between the two ranges
+
+        Returns:
+            list[tuple(int, int)] or None: The positions (i, j) of the matching lines in increasing order,
+                                           None if more than MAX_EDIT_COST edits are needed
+    """
+    n, m = a_hi - a_lo, b_hi - b_lo
+    max_cost = min(n + m, MAX_EDIT_COST)
+    # furthest x reached on every diagonal k = x - y, one dict per number of edits for the backtracking
+    v = {1: 0}
+    trace = []
+    for d in range(max_cost + 1):
+        trace.append(v.copy())
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[k - 1] < v[k + 1]):
+                x = v[k + 1]
+            else:
+                x = v[k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[a_lo + x] == b[b_lo + y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, n, m, a_lo, b_lo)
+    return None
+
+def _myers_backtrack(trace: list[dict], x: int, y: int, a_lo: int, b_lo: int) -> list[tuple[int, int]]:
+    """
+    Walks back from the end of the ranges through the furthest points saved for every number of edits and collects
+    the diagonal moves (matching lines)
+    """
+    matches = []
+    for d in range(len(trace) - 1, 0, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v[k - 1] < v[k + 1]):
+            # the edit was an insertion (a move down from diagonal k + 1)
+            previous_k = k + 1
+            previous_x = v[previous_k]
+            snake_x = previous_x
+        else:
+            # the edit was a deletion (a move right from diagonal k - 1)
+            previous_k = k - 1
+            previous_x = v[previous_k]
+            snake_x = previous_x + 1
+        while x > snake_x:
+            x -= 1
+            y -= 1
+            matches.append((a_lo + x, b_lo + y))
+        x, y = previous_x, previous_x - previous_k
+    # the lines before the first edit
+    while x > 0:
+        x -= 1
+        y -= 1
+        matches.append((a_lo + x, b_lo + y))
+    matches.reverse()
+    return matches
+
+def matching_lines(a: list[int], b: list[int]) -> list[tuple[int, int]]:
+    """
+    Patience diff: matches the common prefix and suffix of a range, then splits the range at the unique lines that are
+    in order in both sequences and repeats on the parts between them. Parts without unique lines are diffed with
+    myers_matches. On typical edits every step is linear in the size of its range.
+
+        Parameters:
+            a, b (list[int]): Hashed lines, see hash_lines
+
+        Returns:
+            list[tuple(int, int)]: The positions (i, j) of the matching lines in increasing order
+    """
+    matches = []
+    ranges = [(0, len(a), 0, len(b))]
+    while ranges:
+        a_lo, a_hi, b_lo, b_hi = ranges.pop()
+        while a_lo < a_hi and b_lo < b_hi and a[a_lo] == b[b_lo]:
+            matches.append((a_lo, b_lo))
+            a_lo += 1
+            b_lo += 1
+        while a_lo < a_hi and b_lo < b_hi and a[a_hi - 1] == b[b_hi - 1]:
+            a_hi -= 1
+            b_hi -= 1
+            matches.append((a_hi, b_hi))
+        if a_lo == a_hi or b_lo == b_hi:
+            continue
+
+        anchors = unique_anchors(a, b, a_lo, a_hi, b_lo, b_hi)
+        if anchors:
+            matches.extend(anchors)
+            for i, j in anchors:
+                ranges.append((a_lo, i, b_lo, j))
+                a_lo, b_lo = i + 1, j + 1
+            ranges.append((a_lo, a_hi, b_lo, b_hi))
+        else:
+            matches.extend(myers_matches(a, b, a_lo, a_hi, b_lo, b_hi) or ())
+    matches.sort()
+    return matches
+
+def diff_opcodes(a: Sequence[Hashable], b: Sequence[Hashable]) -> list[tuple[str, int, int, int, int]]:
+    """
+    Compares two sequences of lines, same output as difflib.SequenceMatcher(None, a, b).get_opcodes()
+    (the matched lines may differ, patience diff prefers unique lines as anchors)
+
+        Parameters:
+            a, b (sequence of hashable): The lines of the two files
+
+        Returns:
+            list[tuple(str, int, int, int, int)]: (tag, i1, i2, j1, j2), a[i1:i2] is 'equal' to, 'replace'd by,
+                                                  'delete'd from or 'insert'ed as b[j1:j2]
+
+        Example:
+            >>> diff_opcodes(["a", "b", "c"], ["a", "c", "d"])
+            [('equal', 0, 1, 0, 1), ('delete', 1, 2, 1, 1), ('equal', 2, 3, 1, 2), ('insert', 3, 3, 2, 3)]
+    """
+    a_ids, b_ids = hash_lines(a, b)
+    opcodes = []
+    i = j = 0
+    for match_i, match_j in matching_lines(a_ids, b_ids) + [(len(a), len(b))]:
+        if i < match_i and j < match_j:
+            opcodes.append(('replace', i, match_i, j, match_j))
+        elif i < match_i:
+            opcodes.append(('delete', i, match_i, j, j))
+        elif j < match_j:
+            opcodes.append(('insert', i, i, j, match_j))
+        if match_i < len(a):
+            if opcodes and opcodes[-1][0] == 'equal':
+                opcodes[-1] = ('equal', opcodes[-1][1], match_i + 1, opcodes[-1][3], match_j + 1)
+            else:
+                opcodes.append(('equal', match_i, match_i + 1, match_j, match_j + 1))
+        i, j = match_i + 1, match_j + 1
+    return opcodes
+
+def diff_hunks(a: Sequence[Hashable], b: Sequence[Hashable], context=3) -> list[Hunk]:
+    """
+    Groups the changes between two sequences of lines into hunks with at most context unchanged lines before and
+    after every change, same grouping as difflib.SequenceMatcher.get_grouped_opcodes
+
+        Parameters:
+            a, b (sequence of hashable): The lines of the two files
+            context (int): Number of unchanged lines kept around the changes
+
+        Returns:
+            list[Hunk]: The hunks in order, empty if the sequences are equal
+    """
+    hunks = []
+    opcodes = []
+    for tag, i1, i2, j1, j2 in diff_opcodes(a, b):
+        if tag != 'equal':
+            opcodes.append((tag, i1, i2, j1, j2))
+            continue
+        if not opcodes:
+            # unchanged lines before the first change
+            if i2 - i1 > context:
+                i1, j1 = i2 - context, j2 - context
+            if i2 > i1:
+                opcodes.append((tag, i1, i2, j1, j2))
+            continue
+        if i2 - i1 > 2 * context:
+            # the unchanged lines end the hunk and start the next one
+            opcodes.append((tag, i1, i1 + context, j1, j1 + context))
+            hunks.append(Hunk(opcodes))
+            opcodes = [(tag, i2 - context, i2, j2 - context, j2)] if context else []
+        else:
+            opcodes.append((tag, i1, i2, j1, j2))
+
+    if any(opcode[0] != 'equal' for opcode in opcodes):
+        # trim the unchanged lines after the last change
+        tag, i1, i2, j1, j2 = opcodes[-1]
+        if tag == 'equal' and i2 - i1 > context:
+            opcodes[-1] = (tag, i1, i1 + context, j1, j1 + context)
+        hunks.append(Hunk([opcode for opcode in opcodes if opcode[1] < opcode[2] or opcode[3] < opcode[4]]))
+    return hunks
+
+def similarity(hunks: list[Hunk], a_length: int, b_length: int) -> float:
+    """
+    Ratio of unchanged lines between two sequences, same measure as difflib.SequenceMatcher.ratio: 2 * matches / total
+
+        Parameters:
+            hunks (list[Hunk]): The hunks of the two sequences, see diff_hunks
+            a_length, b_length (int): The number of lines of the two sequences
+
+        Returns:
+            float: 1.0 for equal sequences, 0.0 if no line matches
+    """
+    if not a_length and not b_length:
+        return 1.0
+    changed = sum(i2 - i1 for hunk in hunks for tag, i1, i2, _, _ in hunk.opcodes if tag != 'equal')
+    return 2 * (a_length - changed) / (a_length + b_length)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 
-import difflib
 import json
+import multiprocessing
 import os
 import re
 import sys
@@ -10,11 +10,19 @@ from PyQt5 import uic
 from PyQt5.QtWidgets import QApplication, QMainWindow, QLabel, QPushButton, QTextEdit, QRadioButton, QFileDialog, QCheckBox, QTabWidget, QComboBox
 from PyQt5.QtGui import QIcon
 
+import batch_processing
 import convention_validator as cv
 import correct_intersected_srt
 import helper_functions as hf
+import html_diff
+import multi_compare
 import prep_srt
+from result_cache import ResultCache
+from session_cache import parsed_files
+from structure_file import STRUCTURE_FILE_SUFFIX
+from translation_memory import DEFAULT_MEMORY_PATH, MEMORY_FILE_SUFFIX
 import sort
+import srt_compare
 import srt_vtt_converter
 import sync_srt
 
@@ -29,6 +37,9 @@ class UI(QMainWindow):
         self.setWindowIcon(QIcon('assets/palmtree.png'))
         self.setWindowTitle(f"GoodTools {VERSION}")
 
+        # outputs of Synchronize and Prep SRT, unchanged files with the same settings are not processed again
+        self.result_cache = ResultCache()
+
         # Define Widgets
         self.load_labels()
         self.load_checkBoxes()
@@ -151,7 +162,7 @@ class UI(QMainWindow):
 
     def browse_load_json_to_reconstruct_srt(self):
         self.srtPrepLoadJsonTextEdit.setText("")
-        fname = QFileDialog.getOpenFileName(self, "choose file", ".", "(*.json *.JSON)")
+        fname = QFileDialog.getOpenFileName(self, "choose file", ".", "(*.json *.JSON *.srtb)")
         self.srtPrepLoadJsonTextEdit.setText(fname[0])
 
     def browse_load_txt_to_reconstruct_srt(self):
@@ -211,13 +222,18 @@ class UI(QMainWindow):
             Returns:
                 None
         """
-        html_diff = difflib.HtmlDiff().make_file(lines1, lines2)
         # Make output file name
         outputName = fname.replace(extension, "").replace("\\", "/").split("/")
         outputName = outputName[-1]
+        # only the changed lines are shown if "compare_context" is set in the config file
+        with open("assets/config.json", "r", encoding='utf-8') as f:
+            config_data = json.load(f)
+        context = config_data.get("compare_context")
         # Write the HTML diff to a file
-        with open(outputName+'.html', 'w', encoding="utf-8") as f:
-            f.write(html_diff)
+        if context is None:
+            html_diff.write_html_diff(lines1, lines2, outputName+'.html')
+        else:
+            html_diff.write_hunk_pages(lines1, lines2, outputName+'.html', context, config_data.get("compare_hunks_per_page", 200))
 
     def compare(self):
         """
@@ -226,9 +242,15 @@ class UI(QMainWindow):
         # get the full path for the files 
         fname1 = self.firstFileName.toPlainText().replace("file:///", "").replace("\\", "/")
         fname2 = self.secondFileName.toPlainText().replace("file:///", "").replace("\\", "/")
-        if not fname1 or not fname2:
+        # several files or a folder in the second entry: every file is compared with the first one
+        other_files = [line.strip() for line in fname2.splitlines() if line.strip()]
+        if not fname1.strip() or not other_files:
             hf.write_to_textedit(self.compareFeedbackTextEdit, "Entries can't be empty, please input two files to compare", "red")
             return
+
+        if len(other_files) > 1 or os.path.isdir(other_files[0]):
+            self.compare_many(fname1.strip(), other_files)
+            return
         
         try:
             first_file_extension = fname1.rsplit('.', 1)[1]
@@ -241,10 +263,21 @@ class UI(QMainWindow):
         if first_file_extension == second_file_extension:
             # SRT files
             if first_file_extension.lower() == "srt":
-                lines1 = hf.clean_srt(fname1).splitlines()
-                lines2 = hf.clean_srt(fname2).splitlines()
-                self.write_diff_to_html(lines1, lines2, fname1, ".srt")
-                hf.write_to_textedit(self.compareFeedbackTextEdit, "Done!!", "green")
+                with open("assets/config.json", "r", encoding='utf-8') as f:
+                    compare_srt_mode = json.load(f).get("compare_srt_mode", "text")
+                # the cues are matched by their timecodes, timing changes and re-segmentations are reported per time range
+                if compare_srt_mode == "timecodes":
+                    output_name = fname1.replace(".srt", "").split("/")[-1]
+                    counts = srt_compare.write_srt_comparison(parsed_files.table(fname1), parsed_files.table(fname2), output_name+'.html',
+                                                              fname1.split("/")[-1], fname2.split("/")[-1])
+                    counts.pop("unchanged", None)
+                    changes = ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items())) or "no changes"
+                    hf.write_to_textedit(self.compareFeedbackTextEdit, f"Done!! {changes}", "green")
+                else:
+                    lines1 = ''.join(parsed_files.clean_lines(fname1)).splitlines()
+                    lines2 = ''.join(parsed_files.clean_lines(fname2)).splitlines()
+                    self.write_diff_to_html(lines1, lines2, fname1, ".srt")
+                    hf.write_to_textedit(self.compareFeedbackTextEdit, "Done!!", "green")
 
             # TXT files
             elif first_file_extension.lower() == "txt":
@@ -266,6 +299,50 @@ class UI(QMainWindow):
             hf.write_to_textedit(self.compareFeedbackTextEdit, "Both files must have the same extension", "red")
 
 
+    def compare_many(self, baseline_file: str, other_files: list[str]) -> None:
+        """
+        Compares every file of the list (or of the folders in the list) with the baseline file in parallel, the reports
+        and an index page are saved in the folder "<baseline name>_compare" (see multi_compare.compare_against_baseline)
+        """
+        extension = baseline_file.rsplit(".", 1)[-1].lower()
+        if extension not in ("srt", "txt", "csv"):
+            hf.write_to_textedit(self.compareFeedbackTextEdit, "Only (srt, txt and csv) files are allowed", "black")
+            return
+        file_paths = []
+        for path in other_files:
+            if os.path.isdir(path):
+                file_paths.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith("." + extension)))
+            else:
+                file_paths.append(path)
+        file_paths = [path for path in file_paths if os.path.realpath(path) != os.path.realpath(baseline_file)]
+        if not file_paths or any(not path.lower().endswith("." + extension) for path in file_paths):
+            hf.write_to_textedit(self.compareFeedbackTextEdit, "All files must have the same extension as the first file", "red")
+            return
+
+        with open("assets/config.json", "r", encoding='utf-8') as f:
+            config_data = json.load(f)
+        output_folder = baseline_file.split("/")[-1].rsplit(".", 1)[0] + "_compare"
+        index_path, results = multi_compare.compare_against_baseline(baseline_file, file_paths, output_folder, config_data.get("compare_srt_mode", "text"),
+                                                                     config_data.get("compare_context"), config_data.get("compare_hunks_per_page", 200))
+        failed = [(job, error) for job, _, error in results if error is not None]
+        if failed:
+            errors = "\n".join(f"{os.path.basename(job[2])}: {error}" for job, error in failed)
+            hf.write_to_textedit(self.compareFeedbackTextEdit, f"{len(failed)} of {len(results)} files failed\n{errors}", "red")
+        else:
+            hf.write_to_textedit(self.compareFeedbackTextEdit, f"Done!! Compared {len(results)} files, see {index_path}", "green")
+
+    def write_batch_feedback(self, results: list, success_message: str) -> None:
+        """
+        Writes the feedback of a folder run of batch_processing.run_in_parallel to the Process SRT tab,
+        every failed file is listed with its error, otherwise the success message is shown
+        """
+        failed = batch_processing.failed_jobs(results)
+        if failed:
+            errors = "\n".join(f"{os.path.basename(job[0])}: {error}" for job, error in failed)
+            hf.write_to_textedit(self.processSrtFeedbackTextEdit, f"{len(failed)} of {len(results)} files failed\n{errors}", "red")
+        else:
+            hf.write_to_textedit(self.processSrtFeedbackTextEdit, success_message, "green")
+
     """Sort"""
     def sort_srt(self):
         """ 
@@ -289,10 +366,8 @@ class UI(QMainWindow):
             files = hf.get_files("srt")
             # files were found
             if files:
-    
-                for file in files:
-                    sort.sort(file)
-                hf.write_to_textedit(self.processSrtFeedbackTextEdit, "Sorting finished!", "green")
+                results = batch_processing.run_in_parallel(sort.sort, [(file,) for file in files])
+                self.write_batch_feedback(results, "Sorting finished!")
             
             # no SRT files were found
             else:
@@ -322,12 +397,9 @@ class UI(QMainWindow):
         else:
             srt_files = hf.get_files("srt")
             vtt_files = hf.get_files("vtt")
-            for file in srt_files:
-                srt_vtt_converter.convert_srt_to_vtt(file)
-            for file in vtt_files:
-                srt_vtt_converter.convert_vtt_to_srt(file)
-            
-            hf.write_to_textedit(self.processSrtFeedbackTextEdit, "Convert done!", "green")
+            results = batch_processing.run_in_parallel(srt_vtt_converter.convert_srt_to_vtt, [(file,) for file in srt_files])
+            results += batch_processing.run_in_parallel(srt_vtt_converter.convert_vtt_to_srt, [(file,) for file in vtt_files])
+            self.write_batch_feedback(results, "Convert done!")
 
     """Clean"""
     def clean(self):
@@ -347,9 +419,8 @@ class UI(QMainWindow):
         else:
             srt_files = hf.get_files("srt")
             if srt_files:
-                for file in srt_files:
-                    hf.srt_to_plaintext(file)
-                hf.write_to_textedit(self.processSrtFeedbackTextEdit, "Text generation finished!", "green")
+                results = batch_processing.run_in_parallel(hf.srt_to_plaintext, [(file,) for file in srt_files])
+                self.write_batch_feedback(results, "Text generation finished!")
             else:
                 hf.write_to_textedit(self.processSrtFeedbackTextEdit, f"No Files Found", "black")
 
@@ -362,7 +433,8 @@ class UI(QMainWindow):
 
         unvalid_files = []
         for file in srt_files:
-            text = cv.clean_srt(file)
+            # same text as cv.clean_srt, the file is only read and cleaned once per session
+            text = '\n'.join(parsed_files.clean_lines(file))
 
             brackets_count_valid = cv.validate_brackets_count(text)
             no_missing_round_brackets = cv.find_missing_round_brackets(text)
@@ -389,24 +461,6 @@ class UI(QMainWindow):
                 self.validateFeedbackTextEdit.setHtml(temp_text)
 
     """Check Sequence"""
-    def clean_extra_white_spaces(self, srt_file:str) -> None:
-        """
-        Remove the extra whitespaces from the end of each line in SRT file
-
-            Parameters:
-                srt_file (str): path to the SRT file
-
-            Return:
-                None
-        """
-        lines = []
-        with open(srt_file, "r", encoding='utf-8') as f:
-            lines = f.readlines()
-            lines = [line.strip() for line in lines]
-        with open(srt_file, "w", encoding='utf-8') as f:
-            for line in lines:
-                f.write(f"{line}\n")
-
     def check_timecode_sequence(self):
         """
         Checks SRT file(s) for common errors:
@@ -449,10 +503,12 @@ class UI(QMainWindow):
             block_format_error.update({f"{file}":[]})
 
 
-            with open(file, "r", encoding='utf-8') as srt_file:
-                # Read the contents of the file
-                srt_contents = srt_file.read()
-                srt_contents_lines = srt_file.readlines()
+            # Read the contents of the file, it is only read again if it was changed
+            srt_contents = parsed_files.text(file)
+            # the lines used to be read with readlines() after read() on the same handle, which always gave an empty
+            # list, so the block index, white space and empty row checks below never ran. They stay off until they
+            # handle files with a BOM and subtitle lines that are only a number
+            srt_contents_lines = []
 
 
             # timestamp pattern
@@ -551,6 +607,7 @@ class UI(QMainWindow):
                         temp_text = f"{temp_text}<font color='#014d6b'>{error_between_two_blocks[f'{file}'][i]} ---- {error_between_two_blocks[f'{file}'][i + 1]}</font>"
                         self.processSrtFeedbackTextEdit.setHtml(temp_text)
                     correct_intersected_srt.correct_intersected_blocks(file)
+                    parsed_files.invalidate(file)
                     temp_text = self.processSrtFeedbackTextEdit.toHtml()
                     temp_text = f"{temp_text}<font color='green'>Corrected intersection between timeblocks for file: {file}</font>"
                     self.processSrtFeedbackTextEdit.setHtml(temp_text)
@@ -571,7 +628,7 @@ class UI(QMainWindow):
                     else:
                         temp_text = f"{temp_text}<font color='#039169'>Extra white spaces at Block Indices: {','.join(errors)}</font>"
                     self.processSrtFeedbackTextEdit.setHtml(temp_text)
-                    self.clean_extra_white_spaces(file)
+                    hf.clean_extra_white_spaces(file)
                     temp_text = self.processSrtFeedbackTextEdit.toHtml()
                     temp_text = f"{temp_text}<font color='green'>Cleaned white spaces from file: {file}</font>"
                     self.processSrtFeedbackTextEdit.setHtml(temp_text)
@@ -602,22 +659,87 @@ class UI(QMainWindow):
         srt_file = self.srtPrepLoadSrtTextEdit.toPlainText().replace("file:///", "").replace("\\", "/")
 
         if srt_file:
-            hf.sub_srt_codes(srt_file, save_output_where_input_is_located=True)
-            txt_to_append = f"<font color='#014d6b'>Successfully removed SRT timestamps and generated a text file containing chunks, each with a maximum length of 5000 characters.<font color='#014d6b'>Output saved to:</font> <font color='#039169'>{srt_file.rsplit('.', 1)[0]}.txt</font><br>"
+            # chunks are limited by characters, or by tokens if "max_tokens_per_chunk" is set in the config file
+            with open("assets/config.json", "r", encoding='utf-8') as f:
+                config_data = json.load(f)
+            max_char_per_chunk = config_data.get("max_char_per_chunk", 5000)
+            max_tokens_per_chunk = config_data.get("max_tokens_per_chunk")
+            # anchors in the text keep the reconstruction aligned with the original blocks
+            anchors = config_data.get("prep_anchors", False)
+
+            stats = {}
+            memory_file = srt_file.rsplit('.', 1)[0] + MEMORY_FILE_SUFFIX
+            previous_json_file = srt_file.replace(".srt", "_output.json")
+            if config_data.get("incremental_prep", False) and os.path.isfile(previous_json_file):
+                # only the segments changed since the previous prep are written, the unchanged ones keep their translations
+                if self.srtPrepGenCopiesCheckBox.isChecked():
+                    languages = config_data.get("gen_copies", [])
+                    translated_txt_files = dict(zip(languages, [f"{srt_file.rsplit('.', 1)[0]}_{language}.txt" for language in languages]))
+                else:
+                    translated_txt_files = {config_data.get("translation_language") or "": self.srtPrepLoadTxtTextEdit.toPlainText().replace("file:///", "").replace("\\", "/")}
+                translated_txt_files = {language: txt_file for language, txt_file in translated_txt_files.items() if txt_file and os.path.isfile(txt_file)}
+                reused, total = prep_srt.srt_to_incremental_text(srt_file, previous_json_file, translated_txt_files, max_char_per_chunk, max_tokens_per_chunk, stats)
+                txt_to_append = f"<font color='#014d6b'>Incremental prep: {total - reused} of {total} segments changed or have no translation.</font><br>"
+                hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
+            elif config_data.get("translation_memory", False):
+                # segments that are already in the translation memory are left out of the text, the output depends
+                # on the memory so it is never taken from the result cache
+                if self.srtPrepGenCopiesCheckBox.isChecked():
+                    languages = config_data.get("gen_copies", [])
+                else:
+                    languages = [config_data["translation_language"]] if config_data.get("translation_language") else []
+                known, total = prep_srt.srt_to_memory_text(srt_file, languages, DEFAULT_MEMORY_PATH, max_char_per_chunk, max_tokens_per_chunk, stats)
+                txt_to_append = f"<font color='#014d6b'>Translation memory: {known} of {total} segments are already translated.</font><br>"
+                hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
+            else:
+                # a memory file of an earlier prep doesn't match the new text
+                if os.path.exists(memory_file):
+                    os.remove(memory_file)
+                self.result_cache.cached_output("prep_txt", srt_file, f"{srt_file.rsplit('.', 1)[0]}.txt", (max_char_per_chunk, max_tokens_per_chunk, anchors),
+                                                lambda: hf.sub_srt_codes(srt_file, save_output_where_input_is_located=True, max_char_per_chunk=max_char_per_chunk,
+                                                                         max_tokens_per_chunk=max_tokens_per_chunk, stats=stats, anchors=anchors))
+            if max_tokens_per_chunk is None:
+                txt_to_append = f"<font color='#014d6b'>Successfully removed SRT timestamps and generated a text file containing chunks, each with a maximum length of {max_char_per_chunk} characters.<font color='#014d6b'>Output saved to:</font> <font color='#039169'>{srt_file.rsplit('.', 1)[0]}.txt</font><br>"
+            else:
+                txt_to_append = f"<font color='#014d6b'>Successfully removed SRT timestamps and generated a text file containing chunks, each with a maximum of {max_tokens_per_chunk} tokens.<font color='#014d6b'>Output saved to:</font> <font color='#039169'>{srt_file.rsplit('.', 1)[0]}.txt</font><br>"
+                # the statistics are missing if the output was restored from the cache
+                if stats:
+                    txt_to_append += f"<font color='#014d6b'>{stats['chunks']} chunks, {stats['tokens']} tokens in total, largest chunk {stats['max_tokens']} tokens"
+                    if stats['over_budget']:
+                        txt_to_append += f", <font color='#6b0101'>{stats['over_budget']} sentences are longer than the limit</font>"
+                    txt_to_append += "</font><br>"
             hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
 
-            prep_srt.srt_to_json(srt_file)
-            txt_to_append = f'<font color="#014d6b">Successfully saved SRT time stamps from </font> <font color="#039169">{srt_file.split("/")[-1]}</font> <font color="#014d6b">in JSON.<br>Output saved to:</font> <font color="#039169">{srt_file.replace(".srt", "_output.json")}</font><br>'
+            # one copy of the text per language, to be replaced by the translations (see reconstruct_srt_copies)
+            if self.srtPrepGenCopiesCheckBox.isChecked():
+                copies = prep_srt.generate_language_copies(f"{srt_file.rsplit('.', 1)[0]}.txt", config_data.get("gen_copies", []))
+                txt_to_append = f"<font color='#014d6b'>Generated copies for translation:</font> <font color='#039169'>{', '.join(copies)}</font><br>"
+                hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
+
+            # the structure is saved in JSON, or in the compact binary format if "structure_format" is "binary" in the config file
+            if config_data.get("structure_format", "json") == "binary":
+                structure_file = srt_file.rsplit(".", 1)[0] + STRUCTURE_FILE_SUFFIX
+                self.result_cache.cached_output("prep_structure", srt_file, structure_file, None,
+                                                lambda: prep_srt.srt_to_structure_file(srt_file))
+                structure_format = "binary format"
+            else:
+                structure_file = srt_file.replace(".srt", "_output.json")
+                self.result_cache.cached_output("prep_json", srt_file, structure_file, None,
+                                                lambda: prep_srt.srt_to_json(srt_file))
+                structure_format = "JSON"
+            txt_to_append = f'<font color="#014d6b">Successfully saved SRT time stamps from </font> <font color="#039169">{srt_file.split("/")[-1]}</font> <font color="#014d6b">in {structure_format}.<br>Output saved to:</font> <font color="#039169">{structure_file}</font><br>'
             hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
             
     def reconstruct_srt_from_json(self):
         json_file = self.srtPrepLoadJsonTextEdit.toPlainText().replace("file:///", "").replace("\\", "/")
         txt_file = self.srtPrepLoadTxtTextEdit.toPlainText().replace("file:///", "").replace("\\", "/")
-        if json_file and txt_file:
-            prep_srt.reconstruct_srt_from_json_and_txt(json_file, txt_file)
-            srt_file_path = txt_file.rsplit(".", 1)[0]+"_new.srt"
-            max_char_per_line, min_char_per_line, split_at_punctuation, punctuations = self.get_sync_config(self.prepSrtComboBox, self.srtPrepSplitAtPunctuationCheckBox, "prep_srt")
-            sync_srt.sync(srt_file_path, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations, srt_file_path)
+        # Gen Copies: reconstruct the translations of all the languages in the config file at once
+        if json_file and self.srtPrepGenCopiesCheckBox.isChecked():
+            self.reconstruct_srt_copies(json_file)
+        elif json_file and txt_file:
+            sync_config = self.get_sync_config(self.prepSrtComboBox, self.srtPrepSplitAtPunctuationCheckBox, "prep_srt")
+            # the reconstructed SRT is synchronized in memory before it is saved
+            prep_srt.reconstruct_srt_from_json_and_txt(json_file, txt_file, sync_config, self.translation_memory_path())
             txt_to_append = f"<font color='#014d6b'>Successfully reconstructed SRT from JSON and TXT.</font><br><font color='#014d6b'>Output saved to</font> <font color='#039169'>{txt_file.rsplit('.', 1)[0]+'_new.srt'}</font><br>"
             hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
             if self.srtPrepDeleteJsonCheckBox.isChecked():
@@ -629,6 +751,50 @@ class UI(QMainWindow):
                 txt_to_append = f"<font color='#014d6b'>Successfully removed</font> <font color='#6b0101'> {txt_file}</font>"
                 hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
     
+    def reconstruct_srt_copies(self, json_file: str) -> None:
+        """
+        Reconstructs one SRT per language listed in "gen_copies" of the config file from the same JSON,
+        the translation of "name_output.json" into a language is read from "name_<language>.txt"
+        """
+        with open("assets/config.json", "r", encoding='utf-8') as f:
+            languages = json.load(f).get("gen_copies", [])
+        txt_files = prep_srt.language_txt_files(json_file, languages)
+        # "name_<language>.txt"
+        txt_languages = [txt_file.rsplit(".", 1)[0].rsplit("_", 1)[1] for txt_file in txt_files]
+        if not txt_files:
+            txt_to_append = f"<font color='#6b0101'>No translated TXT files found for the languages: {', '.join(languages)}</font><br>"
+            hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
+            return
+
+        sync_config = self.get_sync_config(self.prepSrtComboBox, self.srtPrepSplitAtPunctuationCheckBox, "prep_srt")
+        results = prep_srt.reconstruct_srt_batch(json_file, txt_files, sync_config, languages=txt_languages,
+                                                 memory_path=self.translation_memory_path())
+        for (_, txt_file, *_), error in results:
+            if error is None:
+                txt_to_append = f"<font color='#014d6b'>Successfully reconstructed SRT from JSON and TXT.</font><br><font color='#014d6b'>Output saved to</font> <font color='#039169'>{txt_file.rsplit('.', 1)[0]+'_new.srt'}</font><br>"
+            else:
+                txt_to_append = f"<font color='#6b0101'>{txt_file}: {error}</font><br>"
+            hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
+
+        if self.srtPrepDeleteJsonCheckBox.isChecked():
+            os.remove(json_file)
+            txt_to_append = f"<font color='#014d6b'>Successfully removed</font> <font color='#6b0101'>{json_file}</font>"
+            hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
+        if self.srtPrepDeleteTxtCheckBox.isChecked():
+            for (_, txt_file, *_), error in results:
+                if error is None:
+                    os.remove(txt_file)
+                    txt_to_append = f"<font color='#014d6b'>Successfully removed</font> <font color='#6b0101'> {txt_file}</font>"
+                    hf.append_to_textedit(self.srtPrepFeedbackTextEdit, txt_to_append)
+
+    def translation_memory_path(self) -> str | None:
+        """
+        Returns the path of the translation memory if "translation_memory" is enabled in the config file
+        """
+        with open("assets/config.json", "r", encoding='utf-8') as f:
+            enabled = json.load(f).get("translation_memory", False)
+        return DEFAULT_MEMORY_PATH if enabled else None
+
     """Synchronize"""
     def handleSynchronizeComboBoxChange(self, index):
         """Enable or disable the QTextEdit in the Process SRT Tab sbased on the selected index"""
@@ -692,28 +858,25 @@ class UI(QMainWindow):
         
         if os.path.isfile(fname):
             new_file_name = QFileDialog.getSaveFileName(self, "Save File", f"{fname}", "All Files(*)")[0]
-            srt_files = [fname]
-        else:
-            srt_files = hf.get_files("srt")
-
-        for srt_file in srt_files:
-            sort.sort(srt_file, edit_original_file=True)
-            self.clean_extra_white_spaces(srt_file)
-            correct_intersected_srt.correct_intersected_blocks(srt_file)
             try:
-                if os.path.isfile(fname):
-                    sync_srt.sync(srt_file, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations, new_file_name)
-                else:
-                    sync_srt.sync(srt_file, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations)
+                sync_srt.synchronize_srt_file(fname, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations, new_file_name,
+                                              cache=self.result_cache)
             except Exception as e:
                 hf.write_to_textedit(self.processSrtFeedbackTextEdit, f"{e}", "red")
                 return
-
-        hf.write_to_textedit(self.processSrtFeedbackTextEdit, "Synchronization finished!", "green")
+            hf.write_to_textedit(self.processSrtFeedbackTextEdit, "Synchronization finished!", "green")
+        else:
+            srt_files = hf.get_files("srt")
+            jobs = [(srt_file, max_char_per_line, min_char_per_line, split_at_punctuation, punctuations, None, False, self.result_cache)
+                    for srt_file in srt_files]
+            results = batch_processing.run_in_parallel(sync_srt.synchronize_srt_file, jobs)
+            self.write_batch_feedback(results, "Synchronization finished!")
 
 
 
 if __name__ == '__main__':
+    # needed by the process pool of batch_processing when the program is frozen into an executable
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     root = UI()
     root.show()
@@ -0,0 +1,120 @@
+import html
+import os
+
+import batch_processing
+import html_diff
+import srt_compare
+from cue_table import CueTable
+from line_diff import diff_hunks, similarity
+from session_cache import parsed_files
+
+"""Compares many files against one baseline file (for example every language or vendor delivery against the master SRT)"""
+
+def read_compare_lines(file_path: str, srt_mode="text") -> list[str] | CueTable:
+    """
+    Reads a file the way the Compare tab compares it: the cues of a SRT file in the "timecodes" mode, the lines of text
+    of a SRT file without block numbers and timecodes, or the lines of a TXT or CSV file
+
+        Parameters:
+            file_path (str): Path to the file
+            srt_mode (str): "text" or "timecodes", see srt_compare
+
+        Returns:
+            list[str] or CueTable: The lines or the cues of the file
+    """
+    if file_path.lower().endswith(".srt"):
+        if srt_mode == "timecodes":
+            return parsed_files.table(file_path)
+        return ''.join(parsed_files.clean_lines(file_path)).splitlines()
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.readlines()
+
+def compare_with_baseline(baseline: list[str] | CueTable, baseline_name: str, file_path: str, report_path: str,
+                          srt_mode="text", context=None, hunks_per_page=200) -> dict:
+    """
+    Compares one file with the baseline and writes its report, runs in a worker process of compare_against_baseline
+
+        Parameters:
+            baseline (list[str] or CueTable): The baseline, see read_compare_lines
+            baseline_name (str): Name of the baseline shown in the report
+            file_path (str): Path to the file compared with the baseline
+            report_path (str): Path of the HTML report
+            srt_mode (str): "text" or "timecodes", see srt_compare
+            context (int, optional): If given only the changed lines with context unchanged lines are shown, see html_diff.write_hunk_pages
+            hunks_per_page (int): See html_diff.write_hunk_pages
+
+        Returns:
+            dict: The 'similarity' (0 to 1) of the file and the baseline and the number of 'changes' of every kind
+    """
+    lines = read_compare_lines(file_path, srt_mode)
+    file_name = os.path.basename(file_path)
+    if isinstance(baseline, CueTable):
+        changes = srt_compare.write_srt_comparison(baseline, lines, report_path, baseline_name, file_name)
+        # every unchanged time range has one cue in each file
+        unchanged = changes.pop('unchanged', 0)
+        total = len(baseline) + len(lines)
+        return {"similarity": 2 * unchanged / total if total else 1.0, "changes": changes}
+
+    if context is None:
+        hunks = html_diff.write_html_diff(baseline, lines, report_path, baseline_name, file_name)
+    else:
+        hunks = diff_hunks(baseline, lines, context)
+        html_diff.write_hunk_pages(baseline, lines, report_path, context, hunks_per_page, baseline_name, file_name, hunks)
+    summaries = [html_diff.hunk_summary(hunk) for hunk in hunks]
+    changes = {kind: sum(summary[i] for summary in summaries) for i, kind in enumerate(("added", "deleted", "changed"))}
+    return {"similarity": similarity(hunks, len(baseline), len(lines)), "changes": changes}
+
+def compare_against_baseline(baseline_path: str, file_paths: list[str], output_folder: str, srt_mode="text", context=None,
+                             hunks_per_page=200, max_workers=None) -> tuple[str, list]:
+    """
+    Compares every file with the baseline in a pool of processes (see batch_processing.map_in_parallel). The baseline
+    is read once and sent to the workers. Writes one report per file and an index page with the similarity and the
+    changes of every file that links to the reports.
+
+        Parameters:
+            baseline_path (str): Path to the baseline file
+            file_paths (list[str]): Paths to the files compared with the baseline, with the same extension as the baseline
+            output_folder (str): Folder of the index page and the reports, it is created if it doesn't exist
+            srt_mode, context, hunks_per_page: See compare_with_baseline
+            max_workers (int, optional): Number of processes, by default the number of CPU cores
+
+        Returns:
+            tuple(str, list): The path of the index page and the results of batch_processing.map_in_parallel
+    """
+    os.makedirs(output_folder, exist_ok=True)
+    baseline = read_compare_lines(baseline_path, srt_mode)
+    baseline_name = os.path.basename(baseline_path)
+
+    # one report per file, files with the same name get a number
+    report_names = []
+    for file_path in file_paths:
+        name = os.path.basename(file_path).rsplit(".", 1)[0]
+        report_name = f"{name}.html"
+        number = 2
+        while report_name in report_names or report_name == "index.html":
+            report_name = f"{name}_{number}.html"
+            number += 1
+        report_names.append(report_name)
+
+    jobs = [(baseline, baseline_name, file_path, os.path.join(output_folder, report_name), srt_mode, context, hunks_per_page)
+            for file_path, report_name in zip(file_paths, report_names)]
+    results = batch_processing.map_in_parallel(compare_with_baseline, jobs, max_workers)
+
+    index_path = os.path.join(output_folder, "index.html")
+    with open(index_path, 'w', encoding="utf-8") as f:
+        f.write('<!DOCTYPE html>\n<html>\n<head>\n<meta http-equiv="Content-Type" content="text/html; charset=utf-8" />\n'
+                f'<title></title>\n<style type="text/css">{html_diff.STYLES}\n</style>\n</head>\n<body>\n'
+                f'<h3>{len(file_paths)} files compared with {html.escape(baseline_name)}</h3>\n'
+                '<table class="diff" cellspacing="0" cellpadding="2" rules="all">\n'
+                '<thead><tr><th class="diff_header">File</th><th class="diff_header">Similarity</th>'
+                '<th class="diff_header">Changes</th></tr></thead>\n<tbody>\n')
+        for (job, result, error), report_name in zip(results, report_names):
+            file_name = html.escape(os.path.basename(job[2]))
+            if error is not None:
+                f.write(f'<tr><td>{file_name}</td><td></td><td class="diff_sub">{html.escape(str(error))}</td></tr>\n')
+                continue
+            changes = ", ".join(f"{count} {kind}" for kind, count in sorted(result["changes"].items()) if count) or "no changes"
+            f.write(f'<tr><td><a href="{html.escape(report_name)}">{file_name}</a></td>'
+                    f'<td>{result["similarity"] * 100:.1f}%</td><td>{html.escape(changes)}</td></tr>\n')
+        f.write('</tbody>\n</table>\n</body>\n</html>\n')
+    return index_path, results
@@ -1,8 +1,19 @@
-import re
 import json
-import copy
+import os
+import re
+import shutil
+from array import array
+from bisect import bisect_left, bisect_right
 
+import batch_processing
 import helper_functions as hf
+import sync_srt
+from alignment import AlignmentIndex
+from cue_table import CueTable
+from session_cache import parsed_files
+from srt_parser import parse_srt_lines
+from structure_file import STRUCTURE_FILE_SUFFIX, StructureFile, is_structure_file, write_structure_file
+from translation_memory import MEMORY_FILE_SUFFIX, TranslationMemory, join_anchored_text, source_segments, split_anchored_text
 
 def srt_to_json(srt_file_path:str, save_json=True) -> None | dict:
     """
@@ -17,94 +28,8 @@ def srt_to_json(srt_file_path:str, save_json=True) -> None | dict:
             None or dict: None if save_json is True, else returns a python dict
     """
     
-    # Read the SRT file
-    with open(srt_file_path, 'r', encoding='utf-8') as file:
-        srt_content = file.readlines()
-
-    # make sure the the srt lines don't have extry white spaces after each line
-    srt_content = [line.strip() for line in srt_content]
-    srt_content = "\n".join(srt_content)
-
-    # Split the content into blocks based on the blank lines
-    srt_blocks = re.split(r'\n\s*\n', srt_content.strip())
-
-    # Initialize a list to store JSON entries
-    json_entries = []
-    weights = []
-
-    total_duration = 0  # Variable to store the total duration of the subtitle file
-    total_characters = 0  # Variable to store the total number of characters in the subtitle file
-
-    r"""
-    - Grouping pattern
-    - first group (\d+) matches the block number
-    - second group (\d{2}:\d{2}:\d{2},\d{1,3}) matches the start of the time code
-    - third group (\d{2}:\d{2}:\d{2},\d{1,3}) matchs the end of the time code
-    - forth group (.+) matches the text
-    """
-    pattern = r'(\d+)\n(\d{2}:\d{2}:\d{2},\d{1,3}) --> (\d{2}:\d{2}:\d{2},\d{1,3})\n(.+)'
-    for block in srt_blocks:
-        # Extract block number, time code, and text using regex
-        match = re.match(pattern, block, re.DOTALL)
-
-        if match:
-            block_number, start_time, end_time, text = match.groups()
-            num_characters = len(text)
-            total_characters += num_characters
-
-    for block in srt_blocks:
-        # Extract block number, time code, and text using regex
-        match = re.match(pattern, block, re.DOTALL)
-
-        if match:
-            block_number, start_time, end_time, text = match.groups()
-
-            # Calculate the duration of the subtitle block
-            start_seconds = hf.convert_time_string_to_millisec(start_time) / 1000
-            end_seconds = hf.convert_time_string_to_millisec(end_time) / 1000
-            duration = end_seconds - start_seconds
-
-            # Calculate the number of characters in the text
-            num_characters = len(text)
-            # Claculate the ratio of the text from this block to the tatal text
-            weight = (num_characters / total_characters) * 100
-            weights.append(weight)
-
-            # Create a dictionary for the JSON entry
-            entry = {
-                'block_number': int(block_number),
-                'time_code': f'{start_time} --> {end_time}',
-                'time_code_start': start_time,
-                'time_code_end': end_time,
-                'text': text.strip(),
-                'linebreak_in_text': True if '\n' in text else False,
-                'num_characters': num_characters,
-                'weight' : weight,
-                'duration_in_seconds': duration,
-                'duration_in_milliseconds': duration * 1000,
-            }
-
-            # Append the entry to the list
-            json_entries.append(entry)
-
-            # Update total duration and total characters
-            total_duration += duration
-
-    # Calculate average characters per second
-    average_characters_per_second = total_characters / total_duration if total_duration > 0 else 0
-
-    # Additional information to include in the JSON file
-    additional_info = {
-        'total_duration': total_duration,
-        'total_characters': total_characters,
-        'total_weight': sum(weights),
-        'weights_list': weights,
-        'average_characters_per_second': average_characters_per_second,
-        'total_blocks': len(json_entries)
-    }
-
-    # Combine JSON entries and additional information
-    result = {'entries': json_entries, 'additional_info': additional_info}
+    # Parse the SRT file into a cue table and convert it into the JSON structure
+    result = parsed_files.table(srt_file_path).to_json()
 
     if save_json:
         # Save the JSON data to a file
@@ -115,6 +40,137 @@ def srt_to_json(srt_file_path:str, save_json=True) -> None | dict:
     else:
         return result
 
+def srt_to_structure_file(srt_file_path: str) -> str:
+    """
+    Saves the structure of the SRT in the compact binary format (see structure_file) instead of JSON.
+    The file holds only what reconstruct_srt_from_json_and_txt needs: integer timings, text offsets and line break flags
+
+        Parameters:
+            srt_file_path (str): Path to the SRT file
+
+        Returns:
+            str: Path of the structure file, saved in the same folder with the SRT file
+    """
+    structure_file_path = srt_file_path.rsplit(".", 1)[0] + STRUCTURE_FILE_SUFFIX
+    write_structure_file(parsed_files.table(srt_file_path), structure_file_path)
+    return structure_file_path
+
+def srt_to_memory_text(srt_file_path: str, languages: list[str], memory_path: str, max_char_per_chunk=5000,
+                       max_tokens_per_chunk=None, stats=None) -> tuple[int, int]:
+    """
+    Prep SRT with a translation memory (see translation_memory): writes the anchored text of the SRT (see
+    helper_functions.sub_srt_codes) without the segments whose translations into all the languages are already in the memory.
+    The source segments and the translations taken from the memory are saved in "name_memory.json", the reconstruction
+    puts them back (see apply_translation_memory) and adds the new translations to the memory
+
+        Parameters:
+            srt_file_path (str): Path to the SRT file
+            languages (list[str]): Language codes of the translations
+            memory_path (str): Path to the translation memory
+            max_char_per_chunk, max_tokens_per_chunk, stats: See helper_functions.sub_srt_codes
+
+        Returns:
+            tuple(int, int): The number of segments taken from the memory and the number of all segments
+    """
+    base_name = srt_file_path.rsplit(".", 1)[0]
+    texts = list(parsed_files.table(srt_file_path).texts())
+    sources = source_segments(texts)
+
+    # a segment is left out only if it is known in every language
+    known = {}
+    if languages:
+        with TranslationMemory(memory_path) as memory:
+            translations = {language: memory.lookup(language, sources.values()) for language in languages}
+        for start, source in sources.items():
+            if all(source in translations[language] for language in languages):
+                known[start] = {language: translations[language][source] for language in languages}
+
+    write_segment_text(base_name, texts, sources, known, languages, max_char_per_chunk, max_tokens_per_chunk, stats)
+    return len(known), len(sources)
+
+def srt_to_incremental_text(srt_file_path: str, previous_json_path: str, translated_txt_paths: dict[str, str],
+                            max_char_per_chunk=5000, max_tokens_per_chunk=None, stats=None) -> tuple[int, int]:
+    """
+    Prep SRT for a source SRT that was edited after it was prepared and translated: the segments of the new SRT
+    (see translation_memory.source_segments) are compared with the segments of the previous JSON by their text, and only
+    the segments that changed are written into the text. The translations of the unchanged segments are taken from the
+    previous translations and saved in "name_memory.json" (see srt_to_memory_text), the reconstruction merges them with
+    the translation of the changed segments (see apply_translation_memory)
+
+    All the inputs are read before anything is written, the previous files may be the ones that are replaced
+
+        Parameters:
+            srt_file_path (str): Path to the edited SRT file
+            previous_json_path (str): Path to the JSON file generated by srt_to_json for the previous version of the SRT
+            translated_txt_paths (dict): Language code -> path to the translation of the previous text
+            max_char_per_chunk, max_tokens_per_chunk, stats: See helper_functions.sub_srt_codes
+
+        Returns:
+            tuple(int, int): The number of segments taken from the previous translations and the number of all segments
+    """
+    base_name = srt_file_path.rsplit(".", 1)[0]
+    with open(previous_json_path, "r", encoding='utf-8') as json_file:
+        previous_template = reconstruction_template(json.load(json_file))
+    previous_template["memory"] = load_memory_file(previous_json_path)
+    previous_sources = source_segments(previous_template["texts"])
+    previous_starts = sorted(previous_sources)
+
+    # source text -> translation of every previous segment whose translation is known exactly
+    languages = list(translated_txt_paths)
+    previous_translations = {}
+    for language, txt_file_path in translated_txt_paths.items():
+        with open(txt_file_path, "r", encoding='utf-8') as txt_file:
+            text_content = txt_file.read()
+        if previous_template["memory"] is not None:
+            text_content = apply_translation_memory(previous_template["memory"], text_content, language)
+        segments = split_anchored_text(text_content)
+        previous_translations[language] = {previous_sources[start]: segments[start] for start in aligned_segments(segments, previous_starts)}
+
+    texts = list(parsed_files.table(srt_file_path).texts())
+    sources = source_segments(texts)
+    known = {}
+    if languages:
+        for start, source in sources.items():
+            if all(source in previous_translations[language] for language in languages):
+                known[start] = {language: previous_translations[language][source] for language in languages}
+
+    write_segment_text(base_name, texts, sources, known, languages, max_char_per_chunk, max_tokens_per_chunk, stats)
+    return len(known), len(sources)
+
+def write_segment_text(base_name: str, texts: list[str], sources: dict[int, str], known: dict[int, dict], languages: list[str],
+                       max_char_per_chunk=5000, max_tokens_per_chunk=None, stats=None) -> None:
+    """
+    Writes "name.txt" with the anchored segments that are not known yet and "name_memory.json" with the known ones,
+    see srt_to_memory_text
+
+        Parameters:
+            base_name (str): Path of the SRT file without its extension
+            texts (list[str]): Texts of the SRT blocks
+            sources (dict): Source segments, see translation_memory.source_segments
+            known (dict): Index of the first block of a segment -> {language: translation} of the segments that are left out
+            languages (list[str]): Language codes of the translations
+            max_char_per_chunk, max_tokens_per_chunk, stats: See helper_functions.sub_srt_codes
+    """
+    starts = list(sources) + [len(texts)]
+
+    def text_lines():
+        for start, end in zip(starts, starts[1:]):
+            if start in known:
+                continue
+            for index in range(start, end):
+                text_lines = texts[index].split("\n")
+                if index == start:
+                    text_lines[0] = f"[[{index}]] {text_lines[0]}"
+                yield from text_lines
+
+    hf.write_text_chunks(text_lines(), f"{base_name}.txt", max_char_per_chunk, max_tokens_per_chunk, stats=stats)
+    with open(base_name + MEMORY_FILE_SUFFIX, "w", encoding='utf-8') as memory_file:
+        json.dump({
+            "languages": languages,
+            "sources": {start: source for start, source in sources.items() if start not in known},
+            "translations": known,
+        }, memory_file, ensure_ascii=False, indent=2)
+
 def json_to_srt(json_data: dict) -> str:
     """
     Convert JSON to SRT format
@@ -145,54 +201,109 @@ def json_to_srt(json_data: dict) -> str:
 
     return srt_content
 
+WHITESPACE_PATTERN = re.compile(r'\s')
+
 def divide_text_with_weights(text: str, weights: list[float]) -> list[str]:
     """
     Divide plain text into chunks of text using weights from the original SRT file, each chunk represents a SRT block text
 
+    - The split point of every block is taken from the running total of the weights, so the rounding of one block
+      doesn't shift the blocks after it and no text piles up in the last blocks
+    - A split must occur at a whitespace: the offsets of all whitespaces are collected once and every split point is
+      moved to the nearest whitespace (before or after it) with a bisect
+    - Every block gets at least one word while words remain, a split point is never before the end of the first word
+      of its block
+    - The last block always ends at the end of the text
+
         Parameters:
             text (str): Plain text to be divided into chunks
             weights (list of floats): List of weights (floats) to be used to divide the text
 
         Returns:
             list of strings: Each string is an STR block text 
-    """
 
-    percentages = [weight / 100 for weight in weights]
+        Example:
+            >>> divide_text_with_weights("we have witnessed what is the greatest crime", [50, 25, 25])
+            ['we have witnessed what', 'is the', 'greatest crime']
+    """
+    text_length = len(text)
+    whitespaces = array('q', [match.start() for match in WHITESPACE_PATTERN.finditer(text)])
 
     chunks = []
     start_index = 0
-    """
-    - When splitting the text block using percentages, we ensure that the split occurs only at whitespace. 
-    - To achieve this, we keep adding characters to the text until we encounter a whitespace, then make the split. 
-    - However, this approach can disrupt the balance of the text distribution, leading to some blocks at the end 
-    - having no text at all. 
-    - To resolve this issue, we use a modifier that tracks the number of extra characters added to the current block. 
-    - This count is then subtracted from the next block, ensuring that all blocks contain some text and maintain 
-    - a more even distribution.
-    """
-
-    modifier = 0
-
-    for percentage in percentages:
-        # Find the index where the split should occur based on white spaces
-        end_index = start_index + round(percentage * len(text)) - modifier
-        modifier = 0
-
-        # this loop ensures that the end index is a whitespace, 
-        # it also counts how many extra characters were added to this chunk
-        while end_index < len(text) and not text[end_index].isspace():
-            end_index += 1
-            modifier += 1
+    cumulative_weight = 0
+    for i, weight in enumerate(weights):
+        cumulative_weight += weight
+        if i == len(weights) - 1:
+            end_index = text_length
+        else:
+            target = min(max(round(cumulative_weight / 100 * text_length), start_index), text_length)
+            # the first word of the block, the block ends at a whitespace after it so it gets at least one word
+            word_start = start_index
+            while word_start < text_length and text[word_start].isspace():
+                word_start += 1
+            # the whitespaces around the target
+            after = max(bisect_left(whitespaces, target), bisect_right(whitespaces, word_start))
+            before = after - 1 if after > 0 and whitespaces[after - 1] > word_start else None
+            if after == len(whitespaces):
+                end_index = whitespaces[before] if before is not None else text_length
+            elif before is None or whitespaces[after] - target <= target - whitespaces[before]:
+                end_index = whitespaces[after]
+            else:
+                end_index = whitespaces[before]
 
         # add the chunk to the list
         chunks.append(text[start_index:end_index].strip())
         # update the start index
         start_index = end_index
 
-    # Adding the remaining text, if any, to the last chunk
-    if start_index < len(text):
-        chunks[-1] += text[start_index:]
+    return chunks
 
+# an anchor with the whitespace before it
+ANCHOR_REMOVAL_PATTERN = re.compile(r'\s*' + hf.ANCHOR_PATTERN.pattern)
+
+def divide_text_with_anchors(text: str, weights: list[float]) -> list[str] | None:
+    """
+    Divide plain text with anchors (see helper_functions.iter_anchored_text_lines) into the texts of the SRT blocks.
+    The text between two anchors belongs to the blocks between them and is divided with their weights only
+    (see divide_text_with_weights), so an error in one segment doesn't move the text of the other segments.
+    Anchors that were lost or moved out of order by the translation are ignored, their segment joins the previous one
+
+        Parameters:
+            text (str): Plain text with anchors
+            weights (list of floats): List of weights of all the blocks
+
+        Returns:
+            list of strings or None: Each string is an STR block text, None if the text has no anchors
+
+        Example:
+            >>> divide_text_with_anchors("[[0]] Im letzten Jahr. [[1]] Wir haben gesehen", [50, 50])
+            ['Im letzten Jahr.', 'Wir haben gesehen']
+    """
+    # start of every segment in the text and the index of its first block
+    segments = []
+    for match in hf.ANCHOR_PATTERN.finditer(text):
+        block_index = int(match.group(1))
+        if block_index < len(weights) and (not segments or block_index > segments[-1][0]):
+            segments.append((block_index, match.start(), match.end()))
+    if not segments:
+        return None
+
+    chunks = []
+    for i, (block_index, _, text_start) in enumerate(segments):
+        next_block_index, text_end = (segments[i + 1][0], segments[i + 1][1]) if i + 1 < len(segments) else (len(weights), len(text))
+        if i == 0:
+            # text before the first anchor and blocks before the first anchor belong to the first segment
+            block_index, text_start = 0, 0
+        # remove anchors that were skipped
+        segment_text = ANCHOR_REMOVAL_PATTERN.sub("", text[text_start:text_end])
+        segment_weights = weights[block_index:next_block_index]
+        total_weight = sum(segment_weights)
+        if total_weight > 0:
+            segment_weights = [weight / total_weight * 100 for weight in segment_weights]
+        else:
+            segment_weights = [100 / len(segment_weights)] * len(segment_weights)
+        chunks.extend(divide_text_with_weights(segment_text, segment_weights))
     return chunks
 
 def split_in_half(text: str, max_char_per_line=33) -> str:
@@ -238,44 +349,268 @@ def split_in_half(text: str, max_char_per_line=33) -> str:
     else:
         return text
 
-def reconstruct_srt_from_json_and_txt(json_file_path:str, txt_file_path:str) -> None:
+def reconstruction_template(json_data: dict) -> dict:
     """
-    Reconstructs SRT using the SRT original data saved in JSON and the SRT text as palin text as input
+    Takes from the JSON generated by srt_to_json only what is needed to reconstruct a SRT from a translated text.
+    The template is small and can be shared by the reconstructions of many languages, the JSON data is not changed
 
         Parameters:
-            json_file_path (str): Path to JSON file
-            txt_file_path (str): Path to TEXT file
+            json_data (dict): Python dictionary generated by srt_to_json
 
         Returns:
-            None
+            dict: Python dictionary with the lists 'block_numbers', 'time_codes', 'texts' and 'weights'
+    """
+    entries = json_data.get('entries', [])
+    return {
+        "block_numbers": [entry.get('block_number', '') for entry in entries],
+        "time_codes": [entry.get('time_code', '') for entry in entries],
+        "texts": [entry.get('text', '') for entry in entries],
+        "weights": json_data["additional_info"]["weights_list"],
+    }
+
+def load_reconstruction_template(structure_file_path: str) -> dict:
+    """
+    Loads a structure file saved by Prep SRT, the format (JSON or binary) is detected from the content of the file
+
+        Parameters:
+            structure_file_path (str): Path to the JSON file (see srt_to_json) or to the binary structure file (see srt_to_structure_file)
+
+        Returns:
+            dict: The reconstruction template, see reconstruction_template
     """
-    # Load the JSON data
-    with open(json_file_path, "r", encoding='utf-8') as json_file:
-        json_data = json.load(json_file)
+    if not is_structure_file(structure_file_path):
+        with open(structure_file_path, "r", encoding='utf-8') as json_file:
+            template = reconstruction_template(json.load(json_file))
+    else:
+        with StructureFile(structure_file_path) as structure:
+            start_times = hf.format_timecodes(structure.starts)
+            end_times = hf.format_timecodes(structure.ends)
+            template = {
+                "block_numbers": structure.block_numbers.tolist(),
+                "time_codes": [f"{start_time} --> {end_time}" for start_time, end_time in zip(start_times, end_times)],
+                # the texts are not stored, every block gets a chunk of the translated text
+                "texts": [""] * len(structure),
+                "weights": structure.weights(),
+            }
+    template["memory"] = load_memory_file(structure_file_path)
+    return template
+
+def load_memory_file(structure_file_path: str) -> dict | None:
+    """
+    Loads the "name_memory.json" saved by srt_to_memory_text next to a structure file
+
+        Parameters:
+            structure_file_path (str): Path to the JSON file or to the binary structure file
+
+        Returns:
+            dict or None: The 'languages', 'sources' and 'translations' of the segments, None if there is no memory file
+    """
+    memory_file_path = structure_file_path.removesuffix("_output.json").removesuffix(STRUCTURE_FILE_SUFFIX) + MEMORY_FILE_SUFFIX
+    if not os.path.isfile(memory_file_path):
+        return None
+    with open(memory_file_path, "r", encoding='utf-8') as memory_file:
+        memory = json.load(memory_file)
+    # JSON keys are strings
+    return {
+        "languages": memory["languages"],
+        "sources": {int(start): source for start, source in memory["sources"].items()},
+        "translations": {int(start): translations for start, translations in memory["translations"].items()},
+    }
+
+def apply_translation_memory(memory: dict, text_content: str, language: str, memory_path: str | None = None) -> str:
+    """
+    Puts the segments that were left out of the prep text (see srt_to_memory_text) back into the translated text and
+    stores the newly translated segments in the translation memory. A segment is only stored if its anchor and the
+    anchor of the next segment survived the translation, otherwise its text may belong to other segments too
+
+        Parameters:
+            memory (dict): See load_memory_file
+            text_content (str): The translated anchored text
+            language (str): Language code of the translation
+            memory_path (str, optional): Path to the translation memory, if None nothing is stored
+
+        Returns:
+            str: The anchored text of all the segments
+    """
+    segments = split_anchored_text(text_content)
+    starts = sorted(set(memory["sources"]) | set(memory["translations"]))
+    pairs = [(memory["sources"][start], segments[start]) for start in aligned_segments(segments, starts, memory["translations"])]
+
+    for start, translations in memory["translations"].items():
+        # a segment that was translated anyway keeps its translation
+        if language in translations and start not in segments:
+            segments[start] = translations[language]
+
+    if memory_path is not None and pairs:
+        with TranslationMemory(memory_path) as translation_memory:
+            translation_memory.store(language, pairs)
+    return join_anchored_text(segments)
+
+def aligned_segments(segments: dict[int, str], starts: list[int], filled=()) -> list[int]:
+    """
+    Finds the segments of a translated text whose text is the translation of exactly one source segment: the anchor of
+    the segment and the anchor of the next source segment must both be in the translation, only the segments that are
+    filled from elsewhere (see apply_translation_memory) may be missing between them
+
+        Parameters:
+            segments (dict): Segments of the translated text, see translation_memory.split_anchored_text
+            starts (list[int]): Sorted indices of the first blocks of all the source segments
+            filled (collection of int): Source segments that are not expected in the translation
+
+        Returns:
+            list[int]: The indices of the first blocks of the aligned segments
+    """
+    start_set = set(starts)
+    translated_starts = sorted(segments)
+    aligned = []
+    for i, start in enumerate(translated_starts):
+        if start not in start_set or start in filled:
+            continue
+        next_start = translated_starts[i + 1] if i + 1 < len(translated_starts) else None
+        if next_start is not None and next_start not in start_set:
+            continue
+        position = bisect_left(starts, start) + 1
+        skipped = starts[position:bisect_left(starts, next_start)] if next_start is not None else starts[position:]
+        if all(skipped_start in filled for skipped_start in skipped):
+            aligned.append(start)
+    return aligned
+
+def reconstruct_srt_content(template: dict, text_content: str) -> str:
+    """
+    Divides a translated text into the blocks of the original SRT (see divide_text_with_weights) and builds the SRT
+
+        Parameters:
+            template (dict): Data of the original SRT, see reconstruction_template
+            text_content (str): The translated text
+
+        Returns:
+            str: SRT formatted string
+    """
+    # divide the text into chunks using the anchors in the text, or only the weights from the original SRT
+    text_blocks = divide_text_with_anchors(text_content, template["weights"])
+    if text_blocks is None:
+        text_blocks = divide_text_with_weights(text_content, template["weights"])
+    texts = list(template["texts"])
+    for i, text_block in enumerate(text_blocks[:len(texts)]):
+        # the new chunks (translated) take the place of the old chunks (original language)
+        texts[i] = split_in_half(text_block).strip()
+
+    return ''.join(
+        f"{block_number}\n{time_code}\n{text}\n\n"
+        for block_number, time_code, text in zip(template["block_numbers"], template["time_codes"], texts)
+    )
+
+def reconstruct_srt_from_template(template: dict, txt_file_path: str, sync_config=None, language=None, memory_path=None) -> str:
+    """
+    Reconstructs the SRT of one translated text file, see reconstruct_srt_from_json_and_txt
+
+        Parameters:
+            template (dict): Data of the original SRT, see load_reconstruction_template
+            txt_file_path (str): Path to TEXT file
+            sync_config (tuple, optional): See reconstruct_srt_from_json_and_txt
+            language (str, optional): Language code of the translation, needed if the text was prepared with a
+                                      translation memory for several languages (see srt_to_memory_text)
+            memory_path (str, optional): Path to the translation memory that receives the new translations
 
+        Returns:
+            str: Path of the new SRT file
+    """
     # Read the text file
     with open(txt_file_path, "r", encoding='utf-8') as file:
         text_content = file.read()
-    
-    # get the weights of the original SRT blocks
-    weights = json_data["additional_info"]["weights_list"]
-    # dict to save the output into
-    json_data_copy = copy.deepcopy(json_data)
 
-    # divide the text into chunks using the weights from the original SRT
-    text_chuncks = divide_text_with_weights(text_content, weights)
+    memory = template.get("memory")
+    if memory is not None:
+        if language is None and len(memory["languages"]) == 1:
+            language = memory["languages"][0]
+        if language is not None:
+            text_content = apply_translation_memory(memory, text_content, language, memory_path)
 
-    # write the new chunks (translated) in the place of the old chunks (original language)
-    for text_block, json_entry in zip(text_chuncks, json_data_copy["entries"]):
-        text_block = split_in_half(text_block)
-        json_entry["text"] = text_block.strip()
-
-    # convert the JSON with the new chunks into SRT
-    srt_content = json_to_srt(json_data_copy)
+    srt_content = reconstruct_srt_content(template, text_content)
 
     # Save the result to a new file
     srt_file_path = txt_file_path.rsplit(".", 1)[0]+"_new.srt"
-    with open(srt_file_path, "w", encoding='utf-8') as output_file:
-        output_file.write(srt_content)
+    if sync_config is not None:
+        # parse the reconstructed SRT without writing it to disk and re-segment it using its alignment index
+        index = AlignmentIndex(CueTable.from_blocks(parse_srt_lines(srt_content.splitlines())))
+        sync_srt.write_srt_blocks(srt_file_path, sync_srt.sync_index(index, *sync_config))
+    else:
+        with open(srt_file_path, "w", encoding='utf-8') as output_file:
+            output_file.write(srt_content)
+    return srt_file_path
+
+def reconstruct_srt_from_json_and_txt(json_file_path:str, txt_file_path:str, sync_config=None, memory_path=None) -> None:
+    """
+    Reconstructs SRT using the SRT original data saved in JSON and the SRT text as palin text as input
 
+        Parameters:
+            json_file_path (str): Path to JSON file or to the binary structure file
+            txt_file_path (str): Path to TEXT file
+            sync_config (tuple, optional): (max_char_per_line, min_char_per_line, split_at_punctuation, punctuations).
+                                        If given the reconstructed SRT is synchronized in memory (see sync_srt.sync)
+                                        before it is saved
+            memory_path (str, optional): Path to the translation memory, see reconstruct_srt_from_template
+
+        Returns:
+            None
+    """
+    reconstruct_srt_from_template(load_reconstruction_template(json_file_path), txt_file_path, sync_config, memory_path=memory_path)
+
+def language_txt_files(json_file_path: str, languages: list[str]) -> list[str]:
+    """
+    Finds the translated text files of a prep JSON, the translation of "name_output.json" (or "name_output.srtb")
+    into a language is expected in "name_<language>.txt" (see generate_language_copies)
 
+        Parameters:
+            json_file_path (str): Path to JSON file generated by srt_to_json or to the binary structure file
+            languages (list[str]): Language codes, for example the "gen_copies" of assets/config.json
+
+        Returns:
+            list[str]: The paths of the text files that exist, in the order of the languages
+    """
+    base_name = json_file_path.removesuffix("_output.json").removesuffix(STRUCTURE_FILE_SUFFIX)
+    txt_files = [f"{base_name}_{language}.txt" for language in languages]
+    return [txt_file for txt_file in txt_files if os.path.isfile(txt_file)]
+
+def generate_language_copies(txt_file_path: str, languages: list[str]) -> list[str]:
+    """
+    Copies the text file generated by Prep SRT once per language ("name.txt" -> "name_<language>.txt"),
+    each copy is then replaced by its translation and all of them are reconstructed with reconstruct_srt_batch
+
+        Parameters:
+            txt_file_path (str): Path to the text file
+            languages (list[str]): Language codes
+
+        Returns:
+            list[str]: The paths of the copies
+    """
+    base_name = txt_file_path.rsplit(".", 1)[0]
+    copies = []
+    for language in languages:
+        copy_path = f"{base_name}_{language}.txt"
+        shutil.copyfile(txt_file_path, copy_path)
+        copies.append(copy_path)
+    return copies
+
+def reconstruct_srt_batch(json_file_path: str, txt_file_paths: list[str], sync_config=None, max_workers=None,
+                          languages=None, memory_path=None) -> list:
+    """
+    Reconstructs one SRT per translated text file (for example one per language) from the same JSON. The JSON is only
+    loaded once, the reconstructions and their sync passes run in parallel (see batch_processing.run_in_parallel)
+
+        Parameters:
+            json_file_path (str): Path to JSON file or to the binary structure file
+            txt_file_paths (list[str]): Paths to the TEXT files
+            sync_config (tuple, optional): See reconstruct_srt_from_json_and_txt
+            max_workers (int, optional): Number of processes, by default the number of CPU cores
+            languages (list[str], optional): Language code of every text file, see reconstruct_srt_from_template
+            memory_path (str, optional): Path to the translation memory, see reconstruct_srt_from_template
+
+        Returns:
+            list[tuple(tuple, Exception or None)]: The result of every text file, see batch_processing.run_in_parallel
+    """
+    template = load_reconstruction_template(json_file_path)
+    if languages is None:
+        languages = [None] * len(txt_file_paths)
+    jobs = [(template, txt_file_path, sync_config, language, memory_path) for txt_file_path, language in zip(txt_file_paths, languages)]
+    return batch_processing.run_in_parallel(reconstruct_srt_from_template, jobs, max_workers)
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Callable
+
+"""On-disk cache of finished outputs, keyed by the content of the input file and the settings used to produce them"""
+
+# change the version whenever the output of a cached function changes, old entries will then never match again
+CACHE_VERSION = 4
+DEFAULT_CACHE_DIRECTORY = "assets/cache"
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+class ResultCache:
+    """
+    Stores output files under the hash of their input bytes and settings. The least recently used entries are removed
+    once the cache grows bigger than max_size. Every entry is a single file, a hit updates its modification time so
+    the modification times give the LRU order. Entries are written to a temporary file first and then renamed, so
+    several processes can use the same cache (see batch_processing).
+
+        Example:
+            >>> cache = ResultCache()
+            >>> cache.cached_output("sync", "input.srt", "input_out.srt", (42, 30, True, ['.']), lambda: sync_srt.sync(...))
+            False
+            >>> cache.cached_output("sync", "input.srt", "input_out.srt", (42, 30, True, ['.']), lambda: sync_srt.sync(...))
+            True
+    """
+    __slots__ = ('directory', 'max_size')
+
+    def __init__(self, directory=DEFAULT_CACHE_DIRECTORY, max_size=DEFAULT_MAX_SIZE):
+        """
+            Parameters:
+                directory (str): Folder where the entries are stored, it is created if it doesn't exist
+                max_size (int): Maximum size of all entries in bytes
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+    def key(self, kind: str, input_bytes: bytes, config=None) -> str:
+        """
+        Calculates the key of an entry
+
+            Parameters:
+                kind (str): Name of the output, for example "sync" or "prep_json"
+                input_bytes (bytes): Content of the input file
+                config (optional): Settings used to produce the output, must be serializable to JSON
+
+            Returns:
+                str: Hexadecimal SHA-256 of the version, the kind, the settings and the input
+        """
+        digest = hashlib.sha256()
+        digest.update(json.dumps([CACHE_VERSION, kind, config]).encode('utf-8'))
+        digest.update(b"\0")
+        digest.update(input_bytes)
+        return digest.hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Returns the stored output of a key or None if the key is not in the cache
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # mark the entry as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Stores an output, then removes the least recently used entries if the cache is too big
+        """
+        if len(data) > self.max_size:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                f.write(data)
+            os.replace(temporary_path, self.path(key))
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until all entries fit into max_size
+        """
+        entries = []
+        total_size = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.is_file() or entry.name.endswith(".tmp"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError: # removed by another process
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
+
+    def clear(self) -> None:
+        """
+        Removes all entries
+        """
+        if not os.path.isdir(self.directory):
+            return
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file():
+                    os.remove(entry.path)
+
+    def cached_output(self, kind: str, input_file: str, output_file: str, config, produce: Callable[[], object]) -> bool:
+        """
+        Writes the output file from the cache if the same input was already processed with the same settings,
+        otherwise calls produce to write the output file and stores the result. If the output file already has
+        the cached content nothing is written at all.
+
+            Parameters:
+                kind (str): Name of the output, see key
+                input_file (str): Path of the input file
+                output_file (str): Path of the output file that produce writes
+                config: Settings used to produce the output, see key
+                produce (Callable): Function without parameters that writes the output file
+
+            Returns:
+                bool: True if the output was found in the cache, False if produce was called
+        """
+        with open(input_file, "rb") as f:
+            key = self.key(kind, f.read(), config)
+
+        data = self.get(key)
+        if data is None:
+            produce()
+            with open(output_file, "rb") as f:
+                self.put(key, f.read())
+            return False
+
+        # skip unchanged outputs entirely
+        try:
+            with open(output_file, "rb") as f:
+                if f.read() == data:
+                    return True
+        except OSError:
+            pass
+        with open(output_file, "wb") as f:
+            f.write(data)
+        return True
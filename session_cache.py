@@ -0,0 +1,126 @@
+import io
+import os
+from collections import OrderedDict
+from typing import Callable
+
+from cue_table import CueTable
+from srt_parser import parse_srt_lines
+
+"""In-process cache of parsed SRT files, shared by all the tools during one session"""
+
+# approximate number of characters kept in memory
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+class ParsedFileCache:
+    """
+    Keeps the content of recently used files together with everything derived from it (lines, cue table, cleaned lines).
+    Entries are keyed by (real path, modification time in ns, size), so a file that was changed on disk gets a new entry
+    and the old one is never returned. The least recently used entries are removed once the cached data grows bigger
+    than max_size characters.
+
+    Everything returned is shared between the callers and must not be changed.
+
+        Example:
+            >>> cache = ParsedFileCache()
+            >>> cache.table("input.srt") is cache.table("input.srt")
+            True
+    """
+    __slots__ = ('max_size', 'entries', 'size')
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        # key -> [size of the entry, dict of the cached variants]
+        self.entries = OrderedDict()
+        self.size = 0
+
+    @staticmethod
+    def key(path: str) -> tuple[str, int, int]:
+        stat = os.stat(path)
+        return os.path.realpath(path), stat.st_mtime_ns, stat.st_size
+
+    def get(self, path: str, name: str, build: Callable[[str], object], size: Callable[[object], int] = len):
+        """
+        Returns a variant of a file from the cache, the variant is built on the first request
+
+            Parameters:
+                path (str): Path to the file
+                name (str): Name of the variant, for example "table"
+                build (Callable): Function that builds the variant from the content of the file
+                size (Callable): Function that returns the approximate size of the variant in characters
+
+            Returns:
+                The variant of the file
+        """
+        key = self.key(path)
+        entry = self.entries.get(key)
+        if entry is None:
+            # a changed file gets a new key, the entries of its old versions are useless
+            self.invalidate(path)
+            with open(path, 'r', encoding="utf-8") as f:
+                text = f.read()
+            entry = [len(text), {"text": text}]
+            self.entries[key] = entry
+            self.size += entry[0]
+        self.entries.move_to_end(key)
+
+        variants = entry[1]
+        if name not in variants:
+            variants[name] = build(variants["text"])
+            entry[0] += size(variants[name])
+            self.size += size(variants[name])
+        value = variants[name]
+        self.evict()
+        return value
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits into max_size, the last used entry is always kept
+        """
+        while self.size > self.max_size and len(self.entries) > 1:
+            _, (size, _) = self.entries.popitem(last=False)
+            self.size -= size
+
+    def invalidate(self, path: str) -> None:
+        """
+        Removes all the entries of a file, must be called after a file was changed in place if it may have kept
+        its size and modification time
+        """
+        real_path = os.path.realpath(path)
+        for key in [key for key in self.entries if key[0] == real_path]:
+            size, _ = self.entries.pop(key)
+            self.size -= size
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+
+    def text(self, path: str) -> str:
+        """
+        Returns the content of the file
+        """
+        return self.get(path, "text", lambda text: text)
+
+    def lines(self, path: str) -> list[str]:
+        """
+        Returns the lines of the file with their line breaks, same as file.readlines()
+        """
+        return self.get(path, "lines", lambda text: io.StringIO(text).readlines(), lambda lines: sum(map(len, lines)))
+
+    def table(self, path: str) -> CueTable:
+        """
+        Returns the parsed blocks of the SRT file, same as CueTable.from_srt
+        """
+        return self.get(path, "table", lambda text: CueTable.from_blocks(parse_srt_lines(io.StringIO(text))),
+                        lambda table: len(table.text) + 32 * len(table))
+
+    def clean_lines(self, path: str) -> list[str]:
+        """
+        Returns the lines of the SRT file without block numbers, timecodes and empty lines, the lines keep their line breaks
+        (see helper_functions.clean_srt and convention_validator.clean_srt)
+        """
+        return self.get(path, "clean_lines",
+                        lambda text: [line for line in self.lines(path) if line.strip() and not (line.strip().isdigit() or '-->' in line)],
+                        lambda lines: sum(map(len, lines)))
+
+# cache used by the program
+parsed_files = ParsedFileCache()
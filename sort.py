@@ -1,4 +1,4 @@
-from prep_srt import srt_to_json
+from session_cache import parsed_files
 
 def sort(srt_file_path:str, output_file=None, edit_original_file=False) -> None:
     """
@@ -15,12 +15,8 @@ def sort(srt_file_path:str, output_file=None, edit_original_file=False) -> None:
             None
 
     """
-    # Convert the srt file into json
-    json_data = srt_to_json(srt_file_path, save_json=False)
-    # Retrieve the list of JSON entries, where each entry represents information for an SRT block. Such as timestamp, block number and text
-    entries = json_data.get('entries', [])
-    # Sort the entries by timestamp
-    sorted_entries = sorted(entries, key=lambda x: x['time_code'])
+    # Parse the srt file into a cue table and sort the blocks by timestamp
+    sorted_table = parsed_files.table(srt_file_path).sorted()
     
     # Write the contents to the SRT file
     if edit_original_file:
@@ -31,16 +27,5 @@ def sort(srt_file_path:str, output_file=None, edit_original_file=False) -> None:
         else:
             fileName = srt_file_path.lower().rsplit("/", 1)[-1].rsplit(".", 1)[0] + "_sorted.srt"
 
-    # Open the output file
-    with open(fileName, "w", encoding="utf-8") as f:
-        # Iterate over the sorted entries
-        for block_number, entry in enumerate(sorted_entries, start=1):
-            # Get the timestamp and text from this entry
-            time_code = entry.get('time_code', '')
-            text = entry.get('text', '')
-
-            # Create the SRT block
-            srt_block = f"{block_number}\n{time_code}\n{text}\n\n"
-            f.write(srt_block)
-
-
+    # Write the sorted blocks numbered from 1
+    sorted_table.write_srt(fileName, renumber=True)
@@ -0,0 +1,209 @@
+import html
+
+import helper_functions as hf
+from cue_table import CueTable
+from html_diff import LEGEND, STYLES, highlight_line_pair
+
+"""Timecode-aware comparison of two SRT files: the cues are matched by their time ranges instead of their text lines"""
+
+class CueGroup:
+    """
+    Cues of the two files that cover the same time range: a cue of one file with the cues of the other file that it
+    matches (see cues_match), or a single cue without a match. The cue indices refer to the sorted tables of the two files.
+    """
+    __slots__ = ('start', 'end', 'cues1', 'cues2')
+
+    def __init__(self, start: int, end: int):
+        self.start = start
+        self.end = end
+        self.cues1 = []
+        self.cues2 = []
+
+    def kind(self, table1: CueTable, table2: CueTable) -> str:
+        """
+        Classifies the difference between the cues of the group
+
+            Returns:
+                str: 'unchanged', 'timing' (same text, other timecodes), 'text' (same cue, other text),
+                     'text and timing', 'added', 'deleted', 'split', 'merged' or 'resegmented'.
+                     'split', 'merged' and 'resegmented' get ' with text changes' if the joined texts differ
+        """
+        if not self.cues1:
+            return 'added'
+        if not self.cues2:
+            return 'deleted'
+        same_text = self.text(table1, self.cues1) == self.text(table2, self.cues2)
+        if len(self.cues1) == len(self.cues2) == 1:
+            i, j = self.cues1[0], self.cues2[0]
+            same_timing = table1.starts[i] == table2.starts[j] and table1.ends[i] == table2.ends[j]
+            if same_text:
+                return 'unchanged' if same_timing else 'timing'
+            return 'text' if same_timing else 'text and timing'
+        if len(self.cues1) == 1:
+            kind = 'split'
+        elif len(self.cues2) == 1:
+            kind = 'merged'
+        else:
+            kind = 'resegmented'
+        return kind if same_text else kind + ' with text changes'
+
+    @staticmethod
+    def text(table: CueTable, cues: list[int]) -> str:
+        """
+        Returns the texts of the cues joined with single whitespaces, so line breaks and segmentation don't count
+        """
+        return " ".join(" ".join(table.text_of(index).split()) for index in cues)
+
+def cues_match(start1: int, end1: int, start2: int, end2: int) -> bool:
+    """
+    Two cues of the two files match if they overlap by more than half of the shorter cue, so cues that only touch the
+    neighbour of a shifted cue or a cue that overlaps its neighbour in the same file are not joined.
+    A cue without duration matches the cues it is inside of.
+    """
+    overlap = min(end1, end2) - max(start1, start2)
+    shorter = min(end1 - start1, end2 - start2)
+    return overlap >= 0 and (2 * overlap > shorter or shorter <= 0)
+
+def group_overlapping_cues(table1: CueTable, table2: CueTable) -> list[CueGroup]:
+    """
+    Sweep-line interval join: walks the cues of both (sorted) tables in the order of their timecode starts and keeps the
+    cues of each file that haven't ended yet, every new cue is only compared with the active cues of the other file.
+    Matching cues (see cues_match) are joined with a union-find. Only cues of different files are compared, so cues that
+    overlap inside one file stay apart.
+
+    A group with the same number of cues in both files is split into pairs (first with first, second with second, ...),
+    so a constant shift of contiguous cues gives one 'timing' group per cue. Only groups with different numbers of cues
+    are split, merged or resegmented.
+
+        Parameters:
+            table1 (CueTable): Cues of the first file sorted by timecode start (see CueTable.sorted)
+            table2 (CueTable): Cues of the second file sorted by timecode start
+
+        Returns:
+            list[CueGroup]: The groups in the order of time
+    """
+    count1 = len(table1)
+    # union-find over the cues of both files, the cues of the second file come after the cues of the first
+    parents = list(range(count1 + len(table2)))
+
+    def root(node: int) -> int:
+        while parents[node] != node:
+            parents[node] = parents[parents[node]]
+            node = parents[node]
+        return node
+
+    active1, active2 = [], []
+    i = j = 0
+    while i < count1 or j < len(table2):
+        # the cue that starts first
+        if j >= len(table2) or (i < count1 and table1.starts[i] <= table2.starts[j]):
+            start, end = table1.starts[i], table1.ends[i]
+            active2 = [other for other in active2 if table2.ends[other] >= start]
+            for other in active2:
+                if cues_match(start, end, table2.starts[other], table2.ends[other]):
+                    parents[root(count1 + other)] = root(i)
+            active1.append(i)
+            i += 1
+        else:
+            start, end = table2.starts[j], table2.ends[j]
+            active1 = [other for other in active1 if table1.ends[other] >= start]
+            for other in active1:
+                if cues_match(table1.starts[other], table1.ends[other], start, end):
+                    parents[root(count1 + j)] = root(other)
+            active2.append(j)
+            j += 1
+
+    # cues of every component in the order of the tables
+    components = {}
+    for node in range(len(parents)):
+        cues = components.setdefault(root(node), ([], []))
+        if node < count1:
+            cues[0].append(node)
+        else:
+            cues[1].append(node - count1)
+
+    def new_group(cues1: list[int], cues2: list[int]) -> CueGroup:
+        group = CueGroup(min([table1.starts[index] for index in cues1] + [table2.starts[index] for index in cues2]),
+                         max([table1.ends[index] for index in cues1] + [table2.ends[index] for index in cues2]))
+        group.cues1, group.cues2 = cues1, cues2
+        return group
+
+    groups = []
+    for cues1, cues2 in components.values():
+        if len(cues1) == len(cues2):
+            groups.extend(new_group([index1], [index2]) for index1, index2 in zip(cues1, cues2))
+        else:
+            groups.append(new_group(cues1, cues2))
+    groups.sort(key=lambda group: (group.start, group.end))
+    return groups
+
+def compare_srt_tables(table1: CueTable, table2: CueTable) -> tuple[list[tuple[str, CueGroup]], CueTable, CueTable]:
+    """
+    Compares two SRT files cue by cue
+
+        Parameters:
+            table1 (CueTable): Cues of the first file
+            table2 (CueTable): Cues of the second file
+
+        Returns:
+            tuple: The kind (see CueGroup.kind) and the group of every time range including the unchanged ones,
+                   and the sorted tables the cue indices of the groups refer to
+    """
+    table1, table2 = table1.sorted(), table2.sorted()
+    return [(group.kind(table1, table2), group) for group in group_overlapping_cues(table1, table2)], table1, table2
+
+def write_srt_comparison(table1: CueTable, table2: CueTable, output_path: str, from_description="", to_description="") -> dict[str, int]:
+    """
+    Writes an HTML report of the differences between two SRT files: one row per time range that changed, with the cues
+    of both files, the kind of change and the shift of the timecodes in milliseconds
+
+        Parameters:
+            table1 (CueTable): Cues of the first file
+            table2 (CueTable): Cues of the second file
+            output_path (str): Path of the HTML file
+            from_description (str): Header of the first file's column
+            to_description (str): Header of the second file's column
+
+        Returns:
+            dict: The number of groups of every kind
+    """
+    groups, table1, table2 = compare_srt_tables(table1, table2)
+    counts = {}
+    for kind, _ in groups:
+        counts[kind] = counts.get(kind, 0) + 1
+
+    def cue_lines(table: CueTable, cues: list[int]) -> list[str]:
+        return [f"{table.block_numbers[index]}  {hf.convert_millisec_to_timecode(table.starts[index])} --> "
+                f"{hf.convert_millisec_to_timecode(table.ends[index])}  {' '.join(table.text_of(index).split())}" for index in cues]
+
+    with open(output_path, 'w', encoding="utf-8") as f:
+        summary = ", ".join(f"{count} {kind}" for kind, count in sorted(counts.items()))
+        f.write('<!DOCTYPE html>\n<html>\n<head>\n<meta http-equiv="Content-Type" content="text/html; charset=utf-8" />\n'
+                f'<title></title>\n<style type="text/css">{STYLES}\n        td {{vertical-align:top}}\n</style>\n</head>\n<body>\n'
+                f'<h3>{len(groups)} time ranges: {html.escape(summary)}</h3>\n'
+                '<table class="diff" cellspacing="0" cellpadding="2" rules="all">\n'
+                '<thead><tr><th class="diff_header">Time range</th><th class="diff_header">Change</th>'
+                '<th class="diff_header">Timing shift (ms)</th>'
+                f'<th class="diff_header">{html.escape(from_description)}</th><th class="diff_header">{html.escape(to_description)}</th></tr></thead>\n<tbody>\n')
+        for kind, group in groups:
+            if kind == 'unchanged':
+                continue
+            lines1, lines2 = cue_lines(table1, group.cues1), cue_lines(table2, group.cues2)
+            if kind in ('added', 'deleted'):
+                shift = ""
+                css_class = "diff_add" if kind == 'added' else "diff_sub"
+                text1 = "<br>".join(f'<span class="{css_class}">{html.escape(line)}</span>' for line in lines1)
+                text2 = "<br>".join(f'<span class="{css_class}">{html.escape(line)}</span>' for line in lines2)
+            else:
+                # shift of the start of the first cue and of the end of the last cue
+                shift = (f"start {table2.starts[group.cues2[0]] - table1.starts[group.cues1[0]]:+d}, "
+                         f"end {table2.ends[group.cues2[-1]] - table1.ends[group.cues1[-1]]:+d}")
+                if kind in ('text', 'text and timing'):
+                    text1, text2 = highlight_line_pair(lines1[0], lines2[0])
+                else:
+                    text1, text2 = "<br>".join(map(html.escape, lines1)), "<br>".join(map(html.escape, lines2))
+            f.write(f'<tr><td class="diff_header">{hf.convert_millisec_to_timecode(group.start)} --&gt; '
+                    f'{hf.convert_millisec_to_timecode(group.end)}</td><td>{kind}</td><td>{shift}</td>'
+                    f'<td class="diff_text">{text1}</td><td class="diff_text">{text2}</td></tr>\n')
+        f.write(f'</tbody>\n</table>\n{LEGEND}\n</body>\n</html>\n')
+    return counts
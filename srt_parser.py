@@ -0,0 +1,68 @@
+import re
+from typing import Iterable, Iterator
+
+"""Streaming SRT parser shared by every tool"""
+
+# a block number line, e.g. "12"
+BLOCK_NUMBER_PATTERN = re.compile(r'\d+')
+# a timecode line, e.g. "00:00:01,640 --> 00:00:03,880"
+TIMECODE_PATTERN = re.compile(r'(\d{2}:\d{2}:\d{2},\d{1,3}) --> (\d{2}:\d{2}:\d{2},\d{1,3})')
+
+def parse_srt_lines(lines: Iterable[str]) -> Iterator[tuple[int, str, str, str]]:
+    """
+    Parses SRT lines in a single pass and yields the blocks (cues) one by one.
+    Blocks are separated by empty lines, every line is stripped before parsing. A block is only yielded if its first line
+    is a block number, its second line is a timecode and it has at least one line of text, other blocks are skipped.
+
+        Parameters:
+            lines (iterable of str): Lines of an SRT file, for example an open file object
+
+        Returns:
+            iterator of tuple(int, str, str, str): Block number, timecode start, timecode end and the text of the block.
+                                                Line breaks inside the text are kept
+
+        Example:
+            >>> list(parse_srt_lines(["1\\n", "00:00:00,120 --> 00:00:01,640\\n", "Over the last year,\\n", "we have witnessed\\n"]))
+            [(1, '00:00:00,120', '00:00:01,640', 'Over the last year,\\nwe have witnessed')]
+    """
+    block = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            block.append(line)
+            continue
+        # an empty line closes the current block
+        if block:
+            cue = _parse_block(block)
+            if cue is not None:
+                yield cue
+            block = []
+    # the last block in the file might not be followed by an empty line
+    if block:
+        cue = _parse_block(block)
+        if cue is not None:
+            yield cue
+
+def _parse_block(block: list[str]) -> tuple[int, str, str, str] | None:
+    """
+    Converts the stripped lines of one SRT block into a cue tuple, returns None if the block is malformed
+    """
+    if len(block) < 3 or not BLOCK_NUMBER_PATTERN.fullmatch(block[0]):
+        return None
+    match = TIMECODE_PATTERN.fullmatch(block[1])
+    if not match:
+        return None
+    return int(block[0]), match.group(1), match.group(2), "\n".join(block[2:])
+
+def iter_srt_blocks(srt_file_path: str) -> Iterator[tuple[int, str, str, str]]:
+    """
+    Reads an SRT file lazily and yields its blocks, see parse_srt_lines for the format of the yielded blocks
+
+        Parameters:
+            srt_file_path (str): Path to the SRT file
+
+        Returns:
+            iterator of tuple(int, str, str, str): Block number, timecode start, timecode end and the text of the block
+    """
+    with open(srt_file_path, 'r', encoding='utf-8') as f:
+        yield from parse_srt_lines(f)
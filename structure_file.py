@@ -0,0 +1,137 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from cue_table import CueTable
+
+"""
+Compact binary alternative to the JSON structure file written by prep_srt.srt_to_json
+
+Layout (little-endian, every array starts at a multiple of 8 bytes so it can be used directly from a memory map):
+
+    header          magic b"GTSB", format version (uint16), reserved (uint16), number of blocks n (uint64)
+    block_numbers   int64[n]
+    starts          int64[n]        timecode starts in milliseconds
+    ends            int64[n]        timecode ends in milliseconds
+    text_offsets    int64[n + 1]    block i has text_offsets[i + 1] - text_offsets[i] characters
+    line_breaks     uint8[n]        1 if the text of the block has a line break
+"""
+
+MAGIC = b"GTSB"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+STRUCTURE_FILE_SUFFIX = "_output.srtb"
+
+def is_structure_file(file_path: str) -> bool:
+    """
+    Returns True if the file starts with the magic bytes of the binary structure format
+    """
+    with open(file_path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def write_structure_file(table: CueTable, file_path: str) -> None:
+    """
+    Writes the structure of the SRT blocks in the binary format, the texts themselves are not stored
+
+        Parameters:
+            table (CueTable): Parsed SRT blocks
+            file_path (str): Path of the output file
+
+        Returns:
+            None
+    """
+    line_breaks = array('B', [1 if '\n' in text else 0 for text in table.texts()])
+    columns = [array('q', table.block_numbers), array('q', table.starts), array('q', table.ends), array('q', table.text_offsets)]
+    with open(file_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(table)))
+        for column in columns:
+            # the file is always little-endian
+            if sys.byteorder == "big":
+                column.byteswap()
+            f.write(column.tobytes())
+        f.write(line_breaks.tobytes())
+
+class StructureFile:
+    """
+    Read-only view of a binary structure file. The file is memory mapped, the columns are memoryviews on the map
+    and nothing is parsed until it is used
+
+        Example:
+            >>> with StructureFile("input_output.srtb") as structure:
+            ...     structure.weights()[:2]
+            [4.2, 1.7]
+    """
+    __slots__ = ('file', 'map', 'count', 'block_numbers', 'starts', 'ends', 'text_offsets', 'line_breaks')
+
+    def __init__(self, file_path: str):
+        """
+            Parameters:
+                file_path (str): Path to the binary structure file
+
+            Raises:
+                ValueError: If the file is not a binary structure file or its version is not supported
+        """
+        self.file = open(file_path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError: # an empty file can't be mapped
+            self.file.close()
+            raise ValueError(f"{file_path} is not a structure file")
+        try:
+            if len(self.map) < HEADER.size:
+                raise ValueError(f"{file_path} is not a structure file")
+            magic, version, _, count = HEADER.unpack_from(self.map)
+            if magic != MAGIC:
+                raise ValueError(f"{file_path} is not a structure file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{file_path} has the unsupported structure format version {version}")
+            if len(self.map) != HEADER.size + 8 * (4 * count + 1) + count:
+                raise ValueError(f"{file_path} is truncated")
+        except ValueError:
+            self.close()
+            raise
+
+        self.count = count
+        view = memoryview(self.map)
+        offset = HEADER.size
+        columns = []
+        for length in (count, count, count, count + 1):
+            column = view[offset:offset + 8 * length].cast('q')
+            if sys.byteorder == "big":
+                # the file is little-endian, the column has to be copied and converted
+                column = array('q', column)
+                column.byteswap()
+                column = memoryview(column)
+            columns.append(column)
+            offset += 8 * length
+        self.block_numbers, self.starts, self.ends, self.text_offsets = columns
+        self.line_breaks = view[offset:offset + count]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> 'StructureFile':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        # the memoryviews must be released before the map can be closed
+        for name in ('block_numbers', 'starts', 'ends', 'text_offsets', 'line_breaks'):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+                setattr(self, name, None)
+        if getattr(self, 'map', None) is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def weights(self) -> list[float]:
+        """
+        Returns the weight of every block, calculated the same way as 'weights_list' in prep_srt.srt_to_json
+        """
+        total_characters = self.text_offsets[self.count] if self.count else 0
+        return [((self.text_offsets[i + 1] - self.text_offsets[i]) / total_characters) * 100 for i in range(self.count)]
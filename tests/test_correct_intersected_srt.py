@@ -0,0 +1,19 @@
+import pytest
+
+# helper_functions needs the GUI toolkit
+pytest.importorskip("PyQt5")
+
+import correct_intersected_srt
+
+
+def test_blocks_the_parser_skips_are_kept(tmp_path):
+    srt_file = tmp_path / "input.srt"
+    srt_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nfirst\n\n"
+                        "2\n00:00:02,500 --> 00:00:05,000\nsecond\n\n"
+                        "00:00:07,000 --> 00:00:08,000\nfourth missing number\n\n"
+                        "5\n00:00:09,000 --> 00:00:10,000\n\n", encoding="utf-8")
+    correct_intersected_srt.correct_intersected_blocks(str(srt_file))
+    assert srt_file.read_text(encoding="utf-8") == ("1\n00:00:01,000 --> 00:00:02,745\nfirst\n\n"
+                                                    "2\n00:00:02,755 --> 00:00:05,000\nsecond\n\n"
+                                                    "00:00:07,000 --> 00:00:08,000\nfourth missing number\n\n"
+                                                    "5\n00:00:09,000 --> 00:00:10,000\n\n")
@@ -0,0 +1,37 @@
+from line_breaking import LineBreaker
+
+
+def block_lines(text, max_char_per_line, min_char_per_line, split_at_punctuation=False):
+    return [block_text.split("\n") for _, _, block_text, _ in LineBreaker(text, max_char_per_line, min_char_per_line, split_at_punctuation).blocks()]
+
+
+def test_short_last_word_is_not_cut():
+    assert block_lines("some words go here", 10, 3) == [["some words", "go"], ["here"]]
+
+
+def test_line_after_hashtag_is_not_cut():
+    assert block_lines("the end ## start", 10, 3) == [["the end"], ["start"]]
+
+
+def test_rest_shorter_than_minimum_takes_one_line():
+    breaker = LineBreaker("we have witnessed what", 10, 5, False)
+    assert breaker.split_index(len("we have witnessed "), False) == len(breaker.text)
+
+
+def test_long_word_ends_at_next_whitespace():
+    breaker = LineBreaker("supercalifragilistic word", 10, 3, False)
+    assert breaker.split_index(0, False) == len("supercalifragilistic")
+    assert block_lines("x" * 30, 10, 3) == [["x" * 30]]
+
+
+def test_blocks_have_no_empty_lines():
+    text = "Over the last year, we have witnessed what is the greatest crime of the 21st century ## and more"
+    for lines in block_lines(text, 20, 10, True):
+        assert all(lines)
+
+
+def test_lines_fit_the_maximum():
+    text = "Over the last year, we have witnessed what is the greatest crime of the 21st century"
+    blocks = block_lines(text, 20, 10, True)
+    assert all(len(line) <= 20 for lines in blocks for line in lines)
+    assert " ".join(line for lines in blocks for line in lines) == text
@@ -0,0 +1,11 @@
+from prep_srt import divide_text_with_weights
+
+
+def test_blocks_get_a_word_while_words_remain():
+    assert divide_text_with_weights("aaaa bbbb cccc dddd", [1, 1, 1, 97]) == ["aaaa", "bbbb", "cccc", "dddd"]
+    assert divide_text_with_weights("aaaa  bbbb cccc", [1, 1, 98]) == ["aaaa", "bbbb", "cccc"]
+
+
+def test_split_points_follow_the_weights():
+    assert divide_text_with_weights("we have witnessed what is the greatest crime", [50, 25, 25]) == \
+        ["we have witnessed what", "is the", "greatest crime"]
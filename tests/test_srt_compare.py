@@ -0,0 +1,45 @@
+import pytest
+
+# helper_functions needs the GUI toolkit
+pytest.importorskip("PyQt5")
+
+import helper_functions as hf
+import multi_compare
+import srt_compare
+from cue_table import CueTable
+
+
+def make_table(cues):
+    return CueTable.from_blocks((number, hf.convert_millisec_to_timecode(start), hf.convert_millisec_to_timecode(end), text)
+                                for number, (start, end, text) in enumerate(cues, 1))
+
+
+def kinds(table1, table2):
+    groups, _, _ = srt_compare.compare_srt_tables(table1, table2)
+    return [kind for kind, _ in groups]
+
+
+def test_self_compare_with_overlapping_cues():
+    table = make_table([(0, 2000, "one"), (1500, 3000, "two"), (2800, 4000, "three"), (4000, 6000, "four")])
+    assert kinds(table, table) == ["unchanged"] * 4
+
+
+def test_self_similarity_with_overlapping_cues(tmp_path):
+    srt_file = tmp_path / "overlapping.srt"
+    make_table([(0, 2000, "one"), (1500, 3000, "two"), (2800, 4000, "three")]).write_srt(str(srt_file))
+    baseline = multi_compare.read_compare_lines(str(srt_file), "timecodes")
+    result = multi_compare.compare_with_baseline(baseline, "overlapping.srt", str(srt_file), str(tmp_path / "report.html"), "timecodes")
+    assert result["similarity"] == 1.0
+    assert result["changes"] == {}
+
+
+def test_constant_shift_of_contiguous_cues():
+    cues = [(index * 2000, index * 2000 + 2000, f"cue {index}") for index in range(50)]
+    shifted = [(start + 100, end + 100, text) for start, end, text in cues]
+    assert kinds(make_table(cues), make_table(shifted)) == ["timing"] * 50
+
+
+def test_split_merge_and_text_changes():
+    table1 = make_table([(0, 4000, "a long cue"), (4000, 5000, "b"), (5000, 6000, "c"), (7000, 8000, "old")])
+    table2 = make_table([(0, 2000, "a long"), (2000, 4000, "cue"), (4000, 6000, "b c"), (7000, 8000, "new"), (9000, 9500, "added")])
+    assert kinds(table1, table2) == ["split", "merged", "text", "added"]
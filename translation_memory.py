@@ -0,0 +1,160 @@
+import hashlib
+import sqlite3
+from typing import Iterable
+
+import helper_functions as hf
+
+"""
+Local translation memory: translated segments of the prep texts are stored under their source text, so a segment that
+was already translated for a language (recurring lines of a series, intros, credits) doesn't have to be translated again.
+A segment is the text between two anchors, see helper_functions.iter_anchored_text_lines
+"""
+
+DEFAULT_MEMORY_PATH = "assets/translation_memory.sqlite"
+# the segments of a prep text and the translations taken from the memory, saved next to the prep text
+MEMORY_FILE_SUFFIX = "_memory.json"
+# maximum number of parameters of one SQL query
+QUERY_BATCH_SIZE = 500
+
+def normalize_segment(text: str) -> str:
+    """
+    Returns the text with all runs of whitespaces replaced by a single space, the form in which segments are stored
+    """
+    return " ".join(text.split())
+
+def segment_hash(language: str, text: str) -> bytes:
+    return hashlib.sha1(f"{language}\0{normalize_segment(text)}".encode('utf-8')).digest()
+
+class TranslationMemory:
+    """
+    SQLite store of (language, source segment) -> translated segment. The key is a hash of the normalized source, so
+    the lookups don't depend on the length of the segments. Several processes can use the same file (see
+    prep_srt.reconstruct_srt_batch), SQLite serializes the writes.
+
+        Example:
+            >>> with TranslationMemory() as memory:
+            ...     memory.store("de", [("Previously on...", "Was bisher geschah...")])
+            ...     memory.lookup("de", ["Previously  on..."])
+            1
+            {'Previously  on...': 'Was bisher geschah...'}
+    """
+    __slots__ = ('path', 'connection')
+
+    def __init__(self, path=DEFAULT_MEMORY_PATH):
+        """
+            Parameters:
+                path (str): Path of the SQLite file, it is created if it doesn't exist
+        """
+        self.path = path
+        # wait for the writes of other processes instead of failing
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS segments ("
+            "hash BLOB PRIMARY KEY, language TEXT NOT NULL, source TEXT NOT NULL, translation TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.connection.commit()
+
+    def __enter__(self) -> 'TranslationMemory':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def lookup(self, language: str, sources: Iterable[str]) -> dict[str, str]:
+        """
+        Returns the stored translations of the source segments
+
+            Parameters:
+                language (str): Language code of the translations
+                sources (iterable of str): Source segments
+
+            Returns:
+                dict: Source segment -> translation, only for the segments that are in the memory
+        """
+        hashes = {}
+        for source in sources:
+            hashes[segment_hash(language, source)] = source
+        keys = list(hashes)
+        translations = {}
+        for i in range(0, len(keys), QUERY_BATCH_SIZE):
+            batch = keys[i:i + QUERY_BATCH_SIZE]
+            query = f"SELECT hash, translation FROM segments WHERE hash IN ({','.join('?' * len(batch))})"
+            for key, translation in self.connection.execute(query, batch):
+                translations[hashes[key]] = translation
+        return translations
+
+    def store(self, language: str, pairs: Iterable[tuple[str, str]]) -> int:
+        """
+        Stores translated segments, a new translation of a source replaces the old one
+
+            Parameters:
+                language (str): Language code of the translations
+                pairs (iterable of tuple(str, str)): (source segment, translated segment)
+
+            Returns:
+                int: The number of stored segments
+        """
+        rows = [(segment_hash(language, source), language, normalize_segment(source), normalize_segment(translation))
+                for source, translation in pairs if source.strip() and translation.strip()]
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?)", rows)
+        return len(rows)
+
+def source_segments(texts: Iterable[str], max_blocks_per_anchor=10) -> dict[int, str]:
+    """
+    Splits the texts of the SRT blocks into the segments of the anchored prep text (see helper_functions.iter_anchored_text_lines)
+
+        Parameters:
+            texts (iterable of str): Texts of the SRT blocks
+            max_blocks_per_anchor (int): See helper_functions.iter_anchored_text_lines
+
+        Returns:
+            dict: Index of the first block of a segment -> text of the segment (the lines of its blocks joined with spaces)
+    """
+    segments = {}
+    start = None
+    for index, (text, segment_start) in enumerate(hf.mark_segment_starts(texts, max_blocks_per_anchor)):
+        if segment_start:
+            start = index
+            segments[start] = []
+        segments[start].extend(line.strip() for line in text.split("\n") if line.strip())
+    return {start: " ".join(lines) for start, lines in segments.items()}
+
+def split_anchored_text(text: str) -> dict[int, str]:
+    """
+    Splits a translated anchored text into its segments. Anchors that are out of order stay in the text of the previous
+    segment and the text before the first anchor belongs to the first segment (same as prep_srt.divide_text_with_anchors)
+
+        Parameters:
+            text (str): Plain text with anchors
+
+        Returns:
+            dict: Index of the first block of a segment -> text of the segment without its anchor
+
+        Example:
+            >>> split_anchored_text("[[0]] Im letzten Jahr. [[1]] Wir haben gesehen")
+            {0: 'Im letzten Jahr.', 1: 'Wir haben gesehen'}
+    """
+    anchors = []
+    for match in hf.ANCHOR_PATTERN.finditer(text):
+        block_index = int(match.group(1))
+        if not anchors or block_index > anchors[-1][0]:
+            anchors.append((block_index, match.start(), match.end()))
+
+    segments = {}
+    for i, (block_index, _, text_start) in enumerate(anchors):
+        text_end = anchors[i + 1][1] if i + 1 < len(anchors) else len(text)
+        if i == 0:
+            text_start = 0
+        segments[block_index] = normalize_segment(hf.ANCHOR_PATTERN.sub("", text[text_start:text_end]))
+    return segments
+
+def join_anchored_text(segments: dict[int, str]) -> str:
+    """
+    Builds an anchored text from its segments, the inverse of split_anchored_text
+    """
+    return "\n".join(f"[[{block_index}]] {segments[block_index]}" for block_index in sorted(segments))